@@ -1,12 +1,11 @@
 from datetime import datetime, timezone
+import asyncio
 from uuid import uuid4
 from typing import Any, Dict, List, Optional
 import json
-import os
 import re
 from dotenv import load_dotenv
 from uagents import Context, Model, Protocol, Agent
-from hyperon import MeTTa
 
 from uagents_core.contrib.protocols.chat import (
     ChatAcknowledgement,
@@ -17,12 +16,22 @@ from uagents_core.contrib.protocols.chat import (
     chat_protocol_spec,
 )
 
-from metta.banker_rag import BankerRAG
-from metta.knowledge import initialize_banker_knowledge
-from metta.utils import LLM, process_banker_query, extract_game_state_from_message
+from metta.singletons import get_rag, get_llm, get_response_cache
+from metta.utils import (
+    aprocess_banker_query, extract_game_state_from_message, detect_deal_decision,
+    format_banker_message, DEAL_ACCEPTED_TEMPLATE, DEAL_REJECTED_MESSAGE
+)
 
 load_dotenv()
 
+try:
+    # Optional faster event loop; the policy must be set before the Agent
+    # is created because it grabs its loop in the constructor
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    pass
+
 agent = Agent(name="Banker agent", port=8008, mailbox=True, publish_agent_details=True)
 
 class GameState(Model):
@@ -59,20 +68,19 @@ def get_default_game_state() -> Dict[str, Any]:
         "user_card": None
     }
 
-def parse_game_state_from_message(message: str) -> Dict[str, Any]:
+def parse_game_state_from_message(message: str, message_lower: Optional[str] = None) -> Dict[str, Any]:
     """Parse game state from user message."""
     # Try to extract from message first
-    extracted_state = extract_game_state_from_message(message)
+    extracted_state = extract_game_state_from_message(message, message_lower)
     if extracted_state:
         return extracted_state
     
     # Default game state
     return get_default_game_state()
 
-metta = MeTTa()
-initialize_banker_knowledge(metta)
-rag = BankerRAG(metta)
-llm = LLM(api_key=os.getenv("ASI_ONE_API_KEY"))
+rag = get_rag()
+llm = get_llm()
+response_cache = get_response_cache()
 
 chat_proto = Protocol(spec=chat_protocol_spec)
 
@@ -92,27 +100,18 @@ async def handle_message(ctx: Context, sender: str, msg: ChatMessage):
             
             try:
                 # Process banker query with default game state
-                response = process_banker_query(
+                response = await aprocess_banker_query(
                     "start game", 
                     rag, 
                     llm,
                     game_state["remaining_cards"],
                     game_state["burnt_cards"],
-                    game_state["round"]
+                    game_state["round"],
+                    cache=response_cache
                 )
                 
                 # Format response for negotiation
-                if isinstance(response, dict):
-                    if response.get('offer') is not None:
-                        # This is an offer response
-                        answer_text = f"**🎯 Round {response['game_state']['round']} Offer**\n\n"
-                        answer_text += f"💰 **My Offer: ${response['offer']:,}**\n\n"
-                        answer_text += f"💬 **{response['humanized_answer']}**"
-                    else:
-                        # This is a conversational response
-                        answer_text = f"**💬 {response['humanized_answer']}**"
-                else:
-                    answer_text = str(response)
+                answer_text = format_banker_message(response)
                 
                 await ctx.send(sender, create_text_chat(answer_text))
                 
@@ -128,48 +127,34 @@ async def handle_message(ctx: Context, sender: str, msg: ChatMessage):
             ctx.logger.info(f"Got a banker query from {sender}: {user_message}")
             
             try:
+                # Lowercase once for the parser, the cache and deal detection
+                message_lower = user_message.lower()
                 # Parse game state from message
-                game_state = parse_game_state_from_message(user_message)
+                game_state = parse_game_state_from_message(user_message, message_lower)
                 
                 # Process banker query
-                response = process_banker_query(
+                response = await aprocess_banker_query(
                     user_message, 
                     rag, 
                     llm,
                     game_state["remaining_cards"],
                     game_state["burnt_cards"],
-                    game_state["round"]
+                    game_state["round"],
+                    cache=response_cache,
+                    message_lower=message_lower
                 )
                 
                 # Check if player accepted the deal
-                user_message_lower = user_message.lower()
-                # More precise deal acceptance detection
-                deal_phrases = ["accept", "yes", "take it", "i'll take it", "agreed", "i accept", "deal accepted", "take the deal"]
-                rejects_deal = any(phrase in user_message_lower for phrase in ["no deal", "reject", "pass", "no thanks", "decline", "not interested"])
+                deal_decision = detect_deal_decision(user_message, message_lower)
                 
-                if rejects_deal:
+                if deal_decision == "reject":
                     # Player explicitly rejected
-                    answer_text = f"**❌ Deal Rejected**\n\n"
-                    answer_text += f"💬 **Your loss! Better luck next time!**\n\n"
-                    answer_text += f"🎰 **Game Over - Thanks for playing!**"
-                elif any(phrase in user_message_lower for phrase in deal_phrases):
-                    answer_text = f"**🎉 DEAL ACCEPTED! 🎉**\n\n"
-                    answer_text += f"💰 **You've won: ${response['offer']:,}**\n\n"
-                    answer_text += f"💬 **Congratulations! You made the smart choice and walked away with guaranteed money!**\n\n"
-                    answer_text += f"🎰 **Game Over - Thanks for playing!**"
+                    answer_text = DEAL_REJECTED_MESSAGE
+                elif deal_decision == "accept":
+                    answer_text = DEAL_ACCEPTED_TEMPLATE.format(offer=response['offer'])
                 else:
                     # Format response for negotiation
-                    if isinstance(response, dict):
-                        if response.get('offer') is not None:
-                            # This is an offer response
-                            answer_text = f"**🎯 Round {response['game_state']['round']} Offer**\n\n"
-                            answer_text += f"💰 **My Offer: ${response['offer']:,}**\n\n"
-                            answer_text += f"💬 **{response['humanized_answer']}**"
-                        else:
-                            # This is a conversational response
-                            answer_text = f"**💬 {response['humanized_answer']}**"
-                    else:
-                        answer_text = str(response)
+                    answer_text = format_banker_message(response)
                 
                 await ctx.send(sender, create_text_chat(answer_text))
                 
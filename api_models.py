@@ -141,3 +141,6 @@ class ActiveGamesResponse(Model):
     active_games: List[str]
     total_games: int
     timestamp: str
+
+# Shared placeholder state for error responses; use .copy(update=...) to set a game_id
+ERROR_GAME_STATE = GameState(game_id="", round=0, remaining_boxes=[], burnt_boxes=[], status="error")
@@ -1,8 +1,11 @@
 from datetime import datetime, timezone
+import asyncio
 from uuid import uuid4
-from typing import Dict, Any, Optional
+from collections import deque
+from typing import Deque, Dict, Any, Optional, Set
 import json
-import os
+import time
+import weakref
 try:
     from dotenv import load_dotenv
     load_dotenv()
@@ -10,7 +13,6 @@ except ImportError:
     print("Warning: python-dotenv not installed. Please install it with: pip install python-dotenv")
     load_dotenv = lambda: None
 from uagents import Context, Model, Protocol, Agent
-from hyperon import MeTTa
 
 from uagents_core.contrib.protocols.chat import (
     ChatAcknowledgement,
@@ -21,32 +23,90 @@ from uagents_core.contrib.protocols.chat import (
     chat_protocol_spec,
 )
 
-from metta.banker_rag import BankerRAG
-from metta.knowledge import initialize_banker_knowledge
-from metta.utils import LLM, process_banker_query, extract_game_state_from_message
+from metta.singletons import get_rag, get_llm, get_response_cache
+from metta.utils import (
+    aprocess_banker_query, extract_game_state_from_message, detect_deal_decision,
+    format_banker_message, CONVERSATION_MESSAGE_TEMPLATE, DEAL_ACCEPTED_TEMPLATE, DEAL_REJECTED_MESSAGE
+)
 from api_models import (
     StartGameRequest, StartGameResponse, ChatRequest, ChatResponse,
     GameStateRequest, DealActionRequest, DealActionResponse,
     EntryFeeRequest, EntryFeeResponse, AcceptDealRequest, AcceptDealResponse,
     FinalSelectionRequest, FinalSelectionResponse,
     GameHistoryResponse, HealthResponse, ErrorResponse,
-    GameState, BankerResponse, ActiveGamesResponse
+    GameState, BankerResponse, ActiveGamesResponse, ERROR_GAME_STATE
 )
 
 # load_dotenv() is called above in the try-except block
 
+try:
+    # Optional faster event loop; the policy must be set before the Agent
+    # is created because it grabs its loop in the constructor
+    import uvloop
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+except ImportError:
+    pass
+
 # Create the banker agent
 banker_agent = Agent(name="Banker API Agent", port=8009, mailbox=True, publish_agent_details=True)
 
 # Initialize MeTTa and RAG
-metta = MeTTa()
-initialize_banker_knowledge(metta)
-rag = BankerRAG(metta)
-llm = LLM(api_key=os.getenv("ASI_ONE_API_KEY"))
+rag = get_rag()
+llm = get_llm()
+response_cache = get_response_cache()
 
 # In-memory storage for games (in production, use Redis/PostgreSQL)
 active_games: Dict[str, Dict[str, Any]] = {}
-game_messages: Dict[str, list] = {}
+game_messages: Dict[str, Deque[Dict[str, Any]]] = {}
+
+# Oldest messages are dropped once a game's history reaches this size
+MAX_GAME_MESSAGES = 200
+
+# One lock per game, created on first use and dropped once no request holds or awaits it
+_game_locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+def game_lock(game_id: str) -> asyncio.Lock:
+    """Per-game lock guarding read-modify-write updates that span an await."""
+    lock = _game_locks.get(game_id)
+    if lock is None:
+        lock = _game_locks[game_id] = asyncio.Lock()
+    return lock
+
+# Strong references to in-flight persistence tasks so they are not collected
+_background_tasks: Set[asyncio.Task] = set()
+
+async def _persist(game_id: str, history: Optional[Deque[Dict[str, Any]]], entries: tuple):
+    """Append entries to a game's history (the place to add durable storage)."""
+    if history is not None:
+        history.extend(entries)
+
+def persist_in_background(game_id: str, *entries: Dict[str, Any]):
+    """Record history entries off the request's critical path."""
+    # Bind the history now: a later /chat may replace it before the task runs
+    history = game_messages.get(game_id)
+    task = asyncio.create_task(_persist(game_id, history, entries))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+# Timestamps only need ~100ms resolution, so the formatted string is reused
+_TIMESTAMP_TTL = 0.1
+_timestamp_cache = (0.0, "")
+
+def now_iso() -> str:
+    """Current UTC time as an ISO string, reformatted at most every 100ms."""
+    global _timestamp_cache
+    checked_at, stamp = _timestamp_cache
+    now = time.monotonic()
+    if now - checked_at >= _TIMESTAMP_TTL:
+        stamp = datetime.now(timezone.utc).isoformat()
+        _timestamp_cache = (now, stamp)
+    return stamp
+
+# Banker messages for the fixed steps of the 8-box game
+WELCOME_MESSAGE = "**🎰 Welcome to Deal or No Deal! 🎰**\n\n💰 **Entry Fee: $5 PYUSD**\n\n🎯 **Game Setup:**\n- 8 boxes with values: $1, $2, $4, $8, $15, $22, $38, $75\n- Select 1 box to keep (hidden)\n- Eliminate 6 boxes over 6 rounds\n- Final choice: keep your box or switch to the last remaining box\n\n💡 **Pay the entry fee to begin!**"
+ENTRY_FEE_RECEIVED_MESSAGE = "**🎉 Entry fee received! Game is now active! 🎉**\n\n🎯 **Select your box!** Choose one of the 8 boxes to keep:\n- Box 1: $1\n- Box 2: $2\n- Box 3: $4\n- Box 4: $8\n- Box 5: $15\n- Box 6: $22\n- Box 7: $38\n- Box 8: $75\n\n💡 **Tell me which box number you want to keep!**"
+KEPT_BOX_TEMPLATE = "**🎯 You kept your original box!**\n\n💰 **Your box contained: ${selected:,}**\n\n🎁 **The other box had: ${other:,}**\n\n🎉 **Final Result: You won ${won:,}!**"
+SWITCHED_BOX_TEMPLATE = "**🎯 You switched to the other box!**\n\n💰 **The other box contained: ${other:,}**\n\n🎁 **Your original box had: ${selected:,}**\n\n🎉 **Final Result: You won ${won:,}!**"
 
 def get_default_game_state() -> Dict[str, Any]:
     """Get default game state for new games."""
@@ -63,21 +123,19 @@ def get_default_game_state() -> Dict[str, Any]:
         "max_offer_limit": 165
     }
 
+# Required GameState fields that older game dicts may be missing
+_GAME_STATE_REQUIRED = {"round": 0, "remaining_boxes": [], "burnt_boxes": [], "status": "pending_entry_fee"}
+_GAME_STATE_FIELDS = frozenset(GameState.__fields__)
+
 def create_game_state_response(game_id: str, game_data: Dict[str, Any]) -> GameState:
-    """Create GameState response from game data."""
-    return GameState(
-        game_id=game_id,
-        round=game_data.get("round", 0),
-        remaining_boxes=game_data.get("remaining_boxes", []),
-        burnt_boxes=game_data.get("burnt_boxes", []),
-        selected_box=game_data.get("selected_box"),
-        current_offer=game_data.get("current_offer"),
-        expected_value=game_data.get("expected_value"),
-        house_edge=game_data.get("house_edge"),
-        status=game_data.get("status", "pending_entry_fee"),
-        entry_fee_paid=game_data.get("entry_fee_paid", False),
-        max_offer_limit=game_data.get("max_offer_limit", 165)
-    )
+    """Create GameState response from game data.
+
+    Game dicts are only ever filled from validated requests and banker
+    results, so the model is built with construct() and skips re-validation.
+    """
+    fields = dict(_GAME_STATE_REQUIRED)
+    fields.update((key, value) for key, value in game_data.items() if key in _GAME_STATE_FIELDS)
+    return GameState.construct(game_id=game_id, **fields)
 
 # REST API Endpoints
 
@@ -101,14 +159,14 @@ async def start_game(ctx: Context, req: StartGameRequest) -> StartGameResponse:
             "entry_fee_paid": game_state.entry_fee_paid,
             "max_offer_limit": game_state.max_offer_limit
         }
-        game_messages[game_id] = []
+        game_messages[game_id] = deque(maxlen=MAX_GAME_MESSAGES)
         
         # Initial banker message for new game
-        banker_message = "**🎰 Welcome to Deal or No Deal! 🎰**\n\n💰 **Entry Fee: $5 PYUSD**\n\n🎯 **Game Setup:**\n- 8 boxes with values: $1, $2, $4, $8, $15, $22, $38, $75\n- Select 1 box to keep (hidden)\n- Eliminate 6 boxes over 6 rounds\n- Final choice: keep your box or switch to the last remaining box\n\n💡 **Pay the entry fee to begin!**"
+        banker_message = WELCOME_MESSAGE
         
         # Store initial message
-        game_messages[game_id].append({
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+        persist_in_background(game_id, {
+            "timestamp": now_iso(),
             "sender": "banker",
             "message": banker_message,
             "message_type": "game_intro"
@@ -126,7 +184,7 @@ async def start_game(ctx: Context, req: StartGameRequest) -> StartGameResponse:
         ctx.logger.error(f"Error starting game: {e}")
         return StartGameResponse(
             game_id="",
-            game_state=GameState(game_id="", round=0, remaining_boxes=[], burnt_boxes=[], status="error"),
+            game_state=ERROR_GAME_STATE,
             banker_message="",
             success=False,
             error=f"Failed to start game: {str(e)}"
@@ -140,103 +198,106 @@ async def chat_with_banker(ctx: Context, req: ChatRequest) -> ChatResponse:
         game_state = req.game_state
         message_history = req.message_history
         
-        # Update game state with provided data
-        active_games[game_id] = {
-            "round": game_state.round,
-            "remaining_boxes": game_state.remaining_boxes,
-            "burnt_boxes": game_state.burnt_boxes,
-            "selected_box": game_state.selected_box,
-            "current_offer": game_state.current_offer,
-            "expected_value": game_state.expected_value,
-            "house_edge": game_state.house_edge,
-            "status": game_state.status,
-            "entry_fee_paid": game_state.entry_fee_paid,
-            "max_offer_limit": game_state.max_offer_limit
-        }
-        
-        # Update message history
-        game_messages[game_id] = message_history
-        
-        # Add current user message
-        game_messages[game_id].append({
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "sender": "user",
-            "message": req.message,
-            "message_type": "text"
-        })
-        
-        # Process banker query
-        response = process_banker_query(
-            req.message, 
-            rag, 
-            llm,
-            game_state.remaining_boxes,
-            game_state.burnt_boxes,
-            game_state.round
-        )
-        
-        # Check if player accepted/rejected deal
-        user_message_lower = req.message.lower()
-        deal_phrases = ["accept", "yes", "take it", "i'll take it", "agreed", "i accept", "deal accepted", "take the deal"]
-        rejects_deal = any(phrase in user_message_lower for phrase in ["no deal", "reject", "pass", "no thanks", "decline", "not interested"])
-        
-        if rejects_deal:
-            # Player rejected deal
-            banker_message = "**❌ Deal Rejected**\n\n💬 **Your loss! Better luck next time!**\n\n🎰 **Game Over - Thanks for playing!**"
-            active_games[game_id]["status"] = "completed"
-            message_type = "game_over"
-        elif any(phrase in user_message_lower for phrase in deal_phrases):
-            # Player accepted deal
-            offer_amount = active_games[game_id].get("current_offer", 0)
-            banker_message = f"**🎉 DEAL ACCEPTED! 🎉**\n\n💰 **You've won: ${offer_amount:,}**\n\n💬 **Congratulations! You made the smart choice and walked away with guaranteed money!**\n\n🎰 **Game Over - Thanks for playing!**"
-            active_games[game_id]["status"] = "completed"
-            message_type = "deal_accepted"
-        else:
-            # Regular response
-            if isinstance(response, dict):
-                if response.get('offer') is not None:
-                    banker_message = f"**🎯 Round {response['game_state']['round']} Offer**\n\n💰 **My Offer: ${response['offer']:,}**\n\n💬 **{response['humanized_answer']}**"
-                    message_type = "offer"
-                    
-                    # Update game state with new offer
-                    active_games[game_id]["current_offer"] = response['offer']
-                    active_games[game_id]["expected_value"] = response['game_state']['expected_value']
-                    active_games[game_id]["house_edge"] = response['game_state']['house_edge']
-                    active_games[game_id]["round"] = response['game_state']['round']
+        # Serialize turns for the same game across the LLM call
+        async with game_lock(game_id):
+            # Update game state with provided data
+            active_games[game_id] = {
+                "round": game_state.round,
+                "remaining_boxes": game_state.remaining_boxes,
+                "burnt_boxes": game_state.burnt_boxes,
+                "selected_box": game_state.selected_box,
+                "current_offer": game_state.current_offer,
+                "expected_value": game_state.expected_value,
+                "house_edge": game_state.house_edge,
+                "status": game_state.status,
+                "entry_fee_paid": game_state.entry_fee_paid,
+                "max_offer_limit": game_state.max_offer_limit
+            }
+
+            # Update message history
+            game_messages[game_id] = deque(message_history, maxlen=MAX_GAME_MESSAGES)
+
+            # Current user message, stored together with the reply below
+            user_entry = {
+                "timestamp": now_iso(),
+                "sender": "user",
+                "message": req.message,
+                "message_type": "text"
+            }
+
+            # Process banker query
+            message_lower = req.message.lower()
+            response = await aprocess_banker_query(
+                req.message, 
+                rag, 
+                llm,
+                game_state.remaining_boxes,
+                game_state.burnt_boxes,
+                game_state.round,
+                cache=response_cache,
+                message_lower=message_lower
+            )
+
+            # Check if player accepted/rejected deal
+            deal_decision = detect_deal_decision(req.message, message_lower)
+
+            if deal_decision == "reject":
+                # Player rejected deal
+                banker_message = DEAL_REJECTED_MESSAGE
+                active_games[game_id]["status"] = "completed"
+                message_type = "game_over"
+            elif deal_decision == "accept":
+                # Player accepted deal
+                offer_amount = active_games[game_id].get("current_offer", 0)
+                banker_message = DEAL_ACCEPTED_TEMPLATE.format(offer=offer_amount)
+                active_games[game_id]["status"] = "completed"
+                message_type = "deal_accepted"
+            else:
+                # Regular response
+                if isinstance(response, dict):
+                    if response.get('offer') is not None:
+                        banker_message = format_banker_message(response)
+                        message_type = "offer"
+
+                        # Update game state with new offer
+                        active_games[game_id]["current_offer"] = response['offer']
+                        active_games[game_id]["expected_value"] = response['game_state']['expected_value']
+                        active_games[game_id]["house_edge"] = response['game_state']['house_edge']
+                        active_games[game_id]["round"] = response['game_state']['round']
+                    else:
+                        banker_message = CONVERSATION_MESSAGE_TEMPLATE.format(answer=response['humanized_answer'])
+                        message_type = "conversation"
                 else:
-                    banker_message = f"**💬 {response['humanized_answer']}**"
+                    banker_message = str(response)
                     message_type = "conversation"
-            else:
-                banker_message = str(response)
-                message_type = "conversation"
-        
-        # Store banker response
-        game_messages[game_id].append({
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "sender": "banker",
-            "message": banker_message,
-            "message_type": message_type
-        })
-        
-        # Create banker response object
-        banker_response = BankerResponse(
-            message=banker_message,
-            offer=active_games[game_id].get("current_offer"),
-            game_state=create_game_state_response(game_id, active_games[game_id]),
-            message_type=message_type,
-            sentiment=response.get('game_state', {}).get('sentiment') if isinstance(response, dict) else None
-        )
-        
-        ctx.logger.info(f"Processed chat for game {game_id}: {req.message[:50]}...")
-        
-        return ChatResponse(banker_response=banker_response)
+
+            # Store both messages without holding up the reply
+            persist_in_background(game_id, user_entry, {
+                "timestamp": now_iso(),
+                "sender": "banker",
+                "message": banker_message,
+                "message_type": message_type
+            })
+
+            # Create banker response object
+            banker_response = BankerResponse(
+                message=banker_message,
+                offer=active_games[game_id].get("current_offer"),
+                game_state=create_game_state_response(game_id, active_games[game_id]),
+                message_type=message_type,
+                sentiment=response.get('game_state', {}).get('sentiment') if isinstance(response, dict) else None
+            )
+
+            ctx.logger.info(f"Processed chat for game {game_id}: {req.message[:50]}...")
+
+            return ChatResponse(banker_response=banker_response)
         
     except Exception as e:
         ctx.logger.error(f"Error processing chat: {e}")
         return ChatResponse(
             banker_response=BankerResponse(
                 message="I apologize, but I encountered an error processing your request.",
-                game_state=GameState(game_id=req.game_id or "", round=0, remaining_cards=[], burnt_cards=[], status="error")
+                game_state=ERROR_GAME_STATE.copy(update={"game_id": req.game_id or ""})
             ),
             success=False,
             error=f"Failed to process message: {str(e)}"
@@ -250,54 +311,56 @@ async def update_game_state(ctx: Context, req: GameStateRequest) -> ChatResponse
             return ChatResponse(
                 banker_response=BankerResponse(
                     message="Game not found.",
-                    game_state=GameState(game_id="", round=0, remaining_cards=[], burnt_cards=[], status="error")
+                    game_state=ERROR_GAME_STATE
                 ),
                 success=False,
                 error="Game not found"
             )
         
-        # Update game state
-        active_games[req.game_id].update({
-            "remaining_cards": req.remaining_cards,
-            "burnt_cards": req.burnt_cards,
-            "round": req.round,
-            "selected_case": req.selected_case
-        })
-        
-        # Process banker response with updated state
-        response = process_banker_query(
-            f"Game state updated: round {req.round}, remaining cards: {req.remaining_cards}", 
-            rag, 
-            llm,
-            req.remaining_cards,
-            req.burnt_cards,
-            req.round
-        )
-        
-        # Create response
-        if isinstance(response, dict) and response.get('offer') is not None:
-            banker_message = f"**🎯 Round {response['game_state']['round']} Offer**\n\n💰 **My Offer: ${response['offer']:,}**\n\n💬 **{response['humanized_answer']}**"
-            active_games[req.game_id]["current_offer"] = response['offer']
-            active_games[req.game_id]["expected_value"] = response['game_state']['expected_value']
-            active_games[req.game_id]["house_edge"] = response['game_state']['house_edge']
-        else:
-            banker_message = f"**💬 {response['humanized_answer']}**"
-        
-        banker_response = BankerResponse(
-            message=banker_message,
-            offer=active_games[req.game_id].get("current_offer"),
-            game_state=create_game_state_response(req.game_id, active_games[req.game_id]),
-            message_type="offer" if response.get('offer') else "conversation"
-        )
-        
-        return ChatResponse(banker_response=banker_response)
+        async with game_lock(req.game_id):
+            # Update game state
+            active_games[req.game_id].update({
+                "remaining_cards": req.remaining_cards,
+                "burnt_cards": req.burnt_cards,
+                "round": req.round,
+                "selected_case": req.selected_case
+            })
+
+            # Process banker response with updated state
+            response = await aprocess_banker_query(
+                f"Game state updated: round {req.round}, remaining cards: {req.remaining_cards}", 
+                rag, 
+                llm,
+                req.remaining_cards,
+                req.burnt_cards,
+                req.round,
+                cache=response_cache
+            )
+
+            # Create response
+            if isinstance(response, dict) and response.get('offer') is not None:
+                banker_message = format_banker_message(response)
+                active_games[req.game_id]["current_offer"] = response['offer']
+                active_games[req.game_id]["expected_value"] = response['game_state']['expected_value']
+                active_games[req.game_id]["house_edge"] = response['game_state']['house_edge']
+            else:
+                banker_message = CONVERSATION_MESSAGE_TEMPLATE.format(answer=response['humanized_answer'])
+
+            banker_response = BankerResponse(
+                message=banker_message,
+                offer=active_games[req.game_id].get("current_offer"),
+                game_state=create_game_state_response(req.game_id, active_games[req.game_id]),
+                message_type="offer" if response.get('offer') else "conversation"
+            )
+
+            return ChatResponse(banker_response=banker_response)
         
     except Exception as e:
         ctx.logger.error(f"Error updating game state: {e}")
         return ChatResponse(
             banker_response=BankerResponse(
                 message="Error updating game state.",
-                game_state=GameState(game_id=req.game_id, round=0, remaining_cards=[], burnt_cards=[], status="error")
+                game_state=ERROR_GAME_STATE.copy(update={"game_id": req.game_id})
             ),
             success=False,
             error=f"Failed to update game state: {str(e)}"
@@ -324,7 +387,7 @@ async def get_game_history(ctx: Context, game_id: str) -> GameHistoryResponse:
         
         return GameHistoryResponse(
             game_id=game_id,
-            messages=game_messages[game_id],
+            messages=list(game_messages[game_id]),
             final_result=final_result,
             total_winnings=total_winnings
         )
@@ -343,7 +406,7 @@ async def health_check(ctx: Context) -> HealthResponse:
     return HealthResponse(
         status="healthy",
         agent="banker_api_agent",
-        timestamp=datetime.now(timezone.utc).isoformat()
+        timestamp=now_iso()
     )
 
 @banker_agent.on_rest_post("/pay-entry-fee", EntryFeeRequest, EntryFeeResponse)
@@ -354,7 +417,7 @@ async def pay_entry_fee(ctx: Context, req: EntryFeeRequest) -> EntryFeeResponse:
             return EntryFeeResponse(
                 success=False,
                 message="Game not found.",
-                game_state=GameState(game_id="", round=0, remaining_boxes=[], burnt_boxes=[], status="error"),
+                game_state=ERROR_GAME_STATE,
                 error="Game not found"
             )
         
@@ -371,11 +434,11 @@ async def pay_entry_fee(ctx: Context, req: EntryFeeRequest) -> EntryFeeResponse:
         active_games[req.game_id]["status"] = "active"
         
         # Create banker response
-        banker_message = "**🎉 Entry fee received! Game is now active! 🎉**\n\n🎯 **Select your box!** Choose one of the 8 boxes to keep:\n- Box 1: $1\n- Box 2: $2\n- Box 3: $4\n- Box 4: $8\n- Box 5: $15\n- Box 6: $22\n- Box 7: $38\n- Box 8: $75\n\n💡 **Tell me which box number you want to keep!**"
+        banker_message = ENTRY_FEE_RECEIVED_MESSAGE
         
         # Store message
         game_messages[req.game_id].append({
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": now_iso(),
             "sender": "banker",
             "message": banker_message,
             "message_type": "box_selection"
@@ -394,7 +457,7 @@ async def pay_entry_fee(ctx: Context, req: EntryFeeRequest) -> EntryFeeResponse:
         return EntryFeeResponse(
             success=False,
             message="Error processing entry fee.",
-            game_state=GameState(game_id=req.game_id, round=0, remaining_boxes=[], burnt_boxes=[], status="error"),
+            game_state=ERROR_GAME_STATE.copy(update={"game_id": req.game_id}),
             error=f"Failed to process entry fee: {str(e)}"
         )
 
@@ -432,11 +495,11 @@ async def accept_deal(ctx: Context, req: AcceptDealRequest) -> AcceptDealRespons
         active_games[req.game_id]["status"] = "completed"
         active_games[req.game_id]["current_offer"] = req.offer_amount
         
-        banker_message = f"**🎉 DEAL ACCEPTED! 🎉**\n\n💰 **You've won: ${req.offer_amount:,}**\n\n💬 **Congratulations! You made the smart choice and walked away with guaranteed money!**\n\n🎰 **Game Over - Thanks for playing!**"
+        banker_message = DEAL_ACCEPTED_TEMPLATE.format(offer=req.offer_amount)
         
         # Store message
         game_messages[req.game_id].append({
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": now_iso(),
             "sender": "banker",
             "message": banker_message,
             "message_type": "deal_accepted"
@@ -504,17 +567,17 @@ async def final_selection(ctx: Context, req: FinalSelectionRequest) -> FinalSele
         # Determine final amount based on selection
         if req.keep_original_box:
             final_amount = selected_box_value
-            banker_message = f"**🎯 You kept your original box!**\n\n💰 **Your box contained: ${selected_box_value:,}**\n\n🎁 **The other box had: ${other_box_value:,}**\n\n🎉 **Final Result: You won ${final_amount:,}!**"
+            banker_message = KEPT_BOX_TEMPLATE.format(selected=selected_box_value, other=other_box_value, won=final_amount)
         else:
             final_amount = other_box_value
-            banker_message = f"**🎯 You switched to the other box!**\n\n💰 **The other box contained: ${other_box_value:,}**\n\n🎁 **Your original box had: ${selected_box_value:,}**\n\n🎉 **Final Result: You won ${final_amount:,}!**"
+            banker_message = SWITCHED_BOX_TEMPLATE.format(selected=selected_box_value, other=other_box_value, won=final_amount)
         
         # Complete the game
         active_games[req.game_id]["status"] = "completed"
         
         # Store message
         game_messages[req.game_id].append({
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": now_iso(),
             "sender": "banker",
             "message": banker_message,
             "message_type": "final_result"
@@ -547,7 +610,7 @@ async def get_active_games(ctx: Context) -> ActiveGamesResponse:
     return ActiveGamesResponse(
         active_games=list(active_games.keys()),
         total_games=len(active_games),
-        timestamp=datetime.now(timezone.utc).isoformat()
+        timestamp=now_iso()
     )
 
 if __name__ == "__main__":
@@ -3,13 +3,14 @@
 Demo script showing the AI decision-making banker agent in action
 """
 
+import asyncio
 import sys
 import os
 
 # Add the current directory to Python path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-def demo_ai_decisions():
+async def demo_ai_decisions():
     """Demonstrate the AI decision-making capabilities."""
     print("🤖 AI Decision-Making Banker Agent Demo 🤖")
     print("=" * 50)
@@ -18,7 +19,8 @@ def demo_ai_decisions():
         from hyperon import MeTTa
         from metta.knowledge import initialize_banker_knowledge
         from metta.banker_rag import BankerRAG
-        from metta.utils import process_banker_query, LLM
+        from dotenv import load_dotenv
+        from metta.utils import aprocess_banker_query, LLM
         
         # Initialize the system
         metta = MeTTa()
@@ -26,7 +28,8 @@ def demo_ai_decisions():
         rag = BankerRAG(metta)
         
         # Use the real LLM (you'll need to set up your API key)
-        llm = LLM()
+        load_dotenv()
+        llm = LLM(api_key=os.getenv("ASI_ONE_API_KEY"))
         
         # Demo scenarios
         demo_scenarios = [
@@ -62,36 +65,39 @@ def demo_ai_decisions():
             }
         ]
         
-        for i, scenario in enumerate(demo_scenarios, 1):
+        # Ask about every scenario at once; the wait is the slowest reply, not the sum
+        responses = await asyncio.gather(
+            *(aprocess_banker_query(
+                scenario['message'],
+                rag,
+                llm,
+                scenario['cards'],
+                [],  # burnt_cards
+                scenario['round']
+            ) for scenario in demo_scenarios),
+            return_exceptions=True
+        )
+        
+        for i, (scenario, response) in enumerate(zip(demo_scenarios, responses), 1):
             print(f"\n🎯 Scenario {i}: {scenario['description']}")
             print(f"Player says: '{scenario['message']}'")
             print(f"Remaining cards: {scenario['cards']}")
             print(f"Round: {scenario['round']}")
             print("-" * 40)
             
-            try:
-                # Process the query
-                response = process_banker_query(
-                    scenario['message'],
-                    rag,
-                    llm,
-                    scenario['cards'],
-                    [],  # burnt_cards
-                    scenario['round']
-                )
-                
-                # Display the response
-                if response.get('offer') is not None:
-                    print(f"🤖 AI Decision: OFFER")
-                    print(f"💰 Offer: ${response['offer']:,}")
-                    print(f"💬 Message: {response['humanized_answer']}")
-                else:
-                    print(f"🤖 AI Decision: CONVERSATION")
-                    print(f"💬 Message: {response['humanized_answer']}")
-                
-            except Exception as e:
-                print(f"❌ Error processing scenario: {e}")
+            if isinstance(response, Exception):
+                print(f"❌ Error processing scenario: {response}")
                 print("This might be due to missing API key or network issues")
+                continue
+            
+            # Display the response
+            if response.get('offer') is not None:
+                print(f"🤖 AI Decision: OFFER")
+                print(f"💰 Offer: ${response['offer']:,}")
+                print(f"💬 Message: {response['humanized_answer']}")
+            else:
+                print(f"🤖 AI Decision: CONVERSATION")
+                print(f"💬 Message: {response['humanized_answer']}")
         
         print("\n🎉 Demo completed!")
         print("\nKey Features Demonstrated:")
@@ -108,7 +114,7 @@ def demo_ai_decisions():
 
 def main():
     """Run the demo."""
-    demo_ai_decisions()
+    asyncio.run(demo_ai_decisions())
 
 if __name__ == "__main__":
     main()
@@ -1,11 +1,45 @@
 import re
 import random
-from typing import List, Dict, Any
+from bisect import bisect_right
+from typing import List, Dict, Any, Iterable, Optional, Tuple
 from hyperon import MeTTa, E, S, ValueAtom
 
+def _round_phase(round_num: int) -> int:
+    """Index of the game phase (early, mid, late) for a round number."""
+    if round_num <= 2:
+        return 0
+    if round_num <= 4:
+        return 1
+    return 2
+
+# Knowledge subjects and query strings per phase, indexed by _round_phase
+_HOUSE_EDGE_ROUNDS = ("early_round", "mid_round", "late_round")
+_PRESSURE_TACTIC_QUERIES = tuple(
+    f'!(match &self (pressure_tactic {phase}_game $tactic) $tactic)'
+    for phase in ("early", "mid", "late")
+)
+_CONVERSATION_STARTER_PHASES = ("early_game", "mid_game", "late_game")
+_CONVERSATION_STARTER_QUERIES = tuple(
+    f'!(match &self (conversation_starter {phase} $starter) $starter)'
+    for phase in _CONVERSATION_STARTER_PHASES
+)
+# Every starter in one query, as (phase starter) pairs
+_ALL_CONVERSATION_STARTERS_QUERY = '!(match &self (conversation_starter $phase $starter) ($phase $starter))'
+
+# Card tiers for create_engaging_context: small < 10000 <= medium < 100000 <= big
+_CARD_TIER_THRESHOLDS = (10000, 100000)
+_CARD_TIER_TEMPLATES = (
+    "💸 Some smaller amounts: {} - But hey, every dollar counts! ",
+    "💰 Decent numbers waiting: {} - Not bad at all! ",
+    "🔥 MASSIVE cards still in play: {} - The tension is REAL! ",
+)
+
 class BankerRAG:
-    def __init__(self, metta_instance: MeTTa):
+    def __init__(self, metta_instance: MeTTa, facts: Optional[Dict[Tuple[str, str], Any]] = None):
+        """``facts`` maps (relation, subject) to the value seeded into the space,
+        e.g. knowledge.BANKER_FACT_VALUES, so offer math can skip MeTTa for them."""
         self.metta = metta_instance
+        self.facts = facts or {}
         self.game_state = {
             "round": 1,
             "remaining_cards": [],
@@ -13,6 +47,50 @@ class BankerRAG:
             "offer_history": [],
             "user_behavior": "neutral"
         }
+        # Knowledge lookups are deterministic until add_knowledge changes the space
+        self._query_cache: Dict[str, Any] = {}
+
+    def _query_value(self, query_str: str, default: Any) -> Any:
+        """Return the first value matched by a MeTTa query, memoized per query."""
+        if query_str not in self._query_cache:
+            results = self.metta.run(query_str)
+            self._query_cache[query_str] = results[0][0].get_object().value if results and results[0] else None
+        value = self._query_cache[query_str]
+        return default if value is None else value
+
+    def _fact_value(self, relation: str, subject: str, default: Any) -> Any:
+        """Look up a seeded fact directly, querying MeTTa only for facts added later."""
+        value = self.facts.get((relation, subject))
+        if value is None:
+            return self._query_value(f'!(match &self ({relation} {subject} $value) $value)', default)
+        return value
+
+    def warm_cache(self):
+        """Run every fixed knowledge lookup once so the first player turn is served from cache."""
+        for round_num in (1, 3, 5):
+            self.get_house_edge_multiplier(round_num)
+            self.get_pressure_tactic(round_num)
+        self.get_conversation_starters((1, 3, 5))
+        for sentiment in ("confident", "desperate", "aggressive", "neutral"):
+            self.get_sentiment_multiplier(sentiment)
+            self.get_presentation_style(sentiment)
+        for variance in ("high_variance", "low_variance", "medium_variance"):
+            self._fact_value("risk_adjustment", variance, 1.0)
+        for phrase_type in ("big_cards", "risk_reminder", "confidence_builder"):
+            self.get_drama_phrase(phrase_type)
+        self.get_banker_personality_traits()
+
+    def _card_stats(self, remaining_cards: List[int]) -> Tuple[float, int]:
+        """Expected value and value spread (max - min) in a single pass."""
+        total = 0
+        low = high = remaining_cards[0]
+        for card in remaining_cards:
+            total += card
+            if card < low:
+                low = card
+            elif card > high:
+                high = card
+        return total / len(remaining_cards), high - low
 
     def calculate_expected_value(self, remaining_cards: List[int]) -> float:
         """Calculate the expected value of remaining cards."""
@@ -22,47 +100,37 @@ class BankerRAG:
 
     def get_house_edge_multiplier(self, round_num: int) -> float:
         """Get house edge multiplier based on round number."""
-        if round_num <= 2:
-            query_str = '!(match &self (house_edge early_round $multiplier) $multiplier)'
-        elif round_num <= 4:
-            query_str = '!(match &self (house_edge mid_round $multiplier) $multiplier)'
-        else:
-            query_str = '!(match &self (house_edge late_round $multiplier) $multiplier)'
-        
-        results = self.metta.run(query_str)
-        return float(results[0][0].get_object().value) if results and results[0] else 0.75
+        return float(self._fact_value("house_edge", _HOUSE_EDGE_ROUNDS[_round_phase(round_num)], 0.75))
 
     def get_sentiment_multiplier(self, sentiment: str) -> float:
         """Get offer multiplier based on player sentiment."""
-        sentiment = sentiment.strip('"')
-        query_str = f'!(match &self (sentiment_multiplier {sentiment} $multiplier) $multiplier)'
-        results = self.metta.run(query_str)
-        return float(results[0][0].get_object().value) if results and results[0] else 1.0
+        return float(self._fact_value("sentiment_multiplier", sentiment.strip('"'), 1.0))
 
-    def get_risk_adjustment(self, remaining_cards: List[int]) -> float:
+    def get_risk_adjustment(self, remaining_cards: List[int],
+                            stats: Optional[Tuple[float, int]] = None) -> float:
         """Get risk adjustment based on variance of remaining cards."""
         if not remaining_cards:
             return 1.0
         
-        variance = max(remaining_cards) - min(remaining_cards)
-        avg_value = sum(remaining_cards) / len(remaining_cards)
+        avg_value, variance = stats or self._card_stats(remaining_cards)
         
         if variance > avg_value * 2:  # High variance
-            query_str = '!(match &self (risk_adjustment high_variance $adjustment) $adjustment)'
+            level = "high_variance"
         elif variance < avg_value * 0.5:  # Low variance
-            query_str = '!(match &self (risk_adjustment low_variance $adjustment) $adjustment)'
+            level = "low_variance"
         else:  # Medium variance
-            query_str = '!(match &self (risk_adjustment medium_variance $adjustment) $adjustment)'
+            level = "medium_variance"
         
-        results = self.metta.run(query_str)
-        return float(results[0][0].get_object().value) if results and results[0] else 1.0
+        return float(self._fact_value("risk_adjustment", level, 1.0))
 
     def calculate_base_offer(self, remaining_cards: List[int], round_num: int, sentiment: str) -> Dict[str, Any]:
         """Calculate the base offer using MeTTa rules."""
-        expected_value = self.calculate_expected_value(remaining_cards)
+        # One scan of the cards feeds both the expected value and the risk adjustment
+        stats = self._card_stats(remaining_cards) if remaining_cards else None
+        expected_value = stats[0] if stats else 0.0
         house_edge = self.get_house_edge_multiplier(round_num)
         sentiment_mult = self.get_sentiment_multiplier(sentiment)
-        risk_adj = self.get_risk_adjustment(remaining_cards)
+        risk_adj = self.get_risk_adjustment(remaining_cards, stats)
         
         # Apply all multipliers
         base_offer = expected_value * house_edge * sentiment_mult * risk_adj
@@ -83,22 +151,14 @@ class BankerRAG:
 
     def get_pressure_tactic(self, round_num: int) -> str:
         """Get psychological pressure tactic based on round."""
-        if round_num <= 2:
-            query_str = '!(match &self (pressure_tactic early_game $tactic) $tactic)'
-        elif round_num <= 4:
-            query_str = '!(match &self (pressure_tactic mid_game $tactic) $tactic)'
-        else:
-            query_str = '!(match &self (pressure_tactic late_game $tactic) $tactic)'
-        
-        results = self.metta.run(query_str)
-        return results[0][0].get_object().value if results and results[0] else "standard pressure"
+        query_str = _PRESSURE_TACTIC_QUERIES[_round_phase(round_num)]
+        return self._query_value(query_str, "standard pressure")
 
     def get_presentation_style(self, sentiment: str) -> str:
         """Get presentation style based on player sentiment."""
         sentiment = sentiment.strip('"')
         query_str = f'!(match &self (presentation_style {sentiment}_player $style) $style)'
-        results = self.metta.run(query_str)
-        return results[0][0].get_object().value if results and results[0] else "professional and persuasive"
+        return self._query_value(query_str, "professional and persuasive")
 
     def update_game_state(self, round_num: int, remaining_cards: List[int], burnt_cards: List[int], 
                          offer: int, accepted: bool = None):
@@ -112,9 +172,12 @@ class BankerRAG:
             "round": round_num
         })
 
-    def analyze_user_behavior(self, user_message: str) -> str:
-        """Analyze user message to determine sentiment/behavior."""
-        user_message = user_message.lower()
+    def analyze_user_behavior(self, user_message: str, message_lower: Optional[str] = None) -> str:
+        """Analyze user message to determine sentiment/behavior.
+
+        Pass ``message_lower`` when the caller already lowercased the message.
+        """
+        user_message = message_lower if message_lower is not None else user_message.lower()
         
         # Simple keyword-based sentiment analysis
         confident_keywords = ["confident", "sure", "definitely", "bring it on", "let's go", "i'm ready"]
@@ -136,56 +199,57 @@ class BankerRAG:
         
         # Get base tone
         query_str = '!(match &self (personality base_tone $tone) $tone)'
-        results = self.metta.run(query_str)
-        traits["base_tone"] = results[0][0].get_object().value if results and results[0] else "charismatic and engaging"
+        traits["base_tone"] = self._query_value(query_str, "charismatic and engaging")
         
         # Get negotiation style
         query_str = '!(match &self (personality negotiation_style $style) $style)'
-        results = self.metta.run(query_str)
-        traits["negotiation_style"] = results[0][0].get_object().value if results and results[0] else "smooth-talking casino dealer"
+        traits["negotiation_style"] = self._query_value(query_str, "smooth-talking casino dealer")
         
         # Get risk communication
         query_str = '!(match &self (personality risk_communication $comm) $comm)'
-        results = self.metta.run(query_str)
-        traits["risk_communication"] = results[0][0].get_object().value if results and results[0] else "build tension and excitement"
+        traits["risk_communication"] = self._query_value(query_str, "build tension and excitement")
         
         return traits
 
     def get_conversation_starter(self, round_num: int) -> str:
         """Get engaging conversation starter based on round."""
-        if round_num <= 2:
-            query_str = '!(match &self (conversation_starter early_game $starter) $starter)'
-        elif round_num <= 4:
-            query_str = '!(match &self (conversation_starter mid_game $starter) $starter)'
-        else:
-            query_str = '!(match &self (conversation_starter late_game $starter) $starter)'
-        
-        results = self.metta.run(query_str)
-        return results[0][0].get_object().value if results and results[0] else "Let's see what you're made of! 🎰"
+        return self.get_conversation_starters((round_num,))[0]
+
+    def get_conversation_starters(self, rounds: Iterable[int]) -> List[str]:
+        """Get the conversation starter for each round, with at most one MeTTa query."""
+        query_strs = [_CONVERSATION_STARTER_QUERIES[_round_phase(round_num)] for round_num in rounds]
+        if any(query_str not in self._query_cache for query_str in query_strs):
+            # Fetch every phase at once and memoize each under its single-phase query
+            starters = {}
+            results = self.metta.run(_ALL_CONVERSATION_STARTERS_QUERY)
+            for pair in (results[0] if results else []):
+                phase, starter = pair.get_children()
+                starters.setdefault(phase.get_name(), starter.get_object().value)
+            for phase, query_str in zip(_CONVERSATION_STARTER_PHASES, _CONVERSATION_STARTER_QUERIES):
+                self._query_cache[query_str] = starters.get(phase)
+        return [self._query_value(query_str, "Let's see what you're made of! 🎰") for query_str in query_strs]
 
     def get_drama_phrase(self, phrase_type: str) -> str:
         """Get drama-building phrase based on type."""
         query_str = f'!(match &self (drama_phrase {phrase_type} $phrase) $phrase)'
-        results = self.metta.run(query_str)
-        return results[0][0].get_object().value if results and results[0] else "The stakes are high! 💰"
+        return self._query_value(query_str, "The stakes are high! 💰")
 
     def create_engaging_context(self, remaining_cards: List[int], round_num: int, sentiment: str) -> str:
         """Create engaging context for the LLM with drama and personality."""
         # Get conversation starter
         starter = self.get_conversation_starter(round_num)
         
-        # Analyze remaining cards for drama
-        big_cards = [card for card in remaining_cards if card >= 100000]
-        medium_cards = [card for card in remaining_cards if 10000 <= card < 100000]
-        small_cards = [card for card in remaining_cards if card < 10000]
+        # Analyze remaining cards for drama, sorting each card into its tier in one pass
+        tiers = tuple([] for _ in _CARD_TIER_TEMPLATES)
+        for card in remaining_cards:
+            tiers[bisect_right(_CARD_TIER_THRESHOLDS, card)].append(card)
         
-        drama_context = ""
-        if big_cards:
-            drama_context += f"🔥 MASSIVE cards still in play: {big_cards} - The tension is REAL! "
-        if medium_cards:
-            drama_context += f"💰 Decent numbers waiting: {medium_cards} - Not bad at all! "
-        if small_cards:
-            drama_context += f"💸 Some smaller amounts: {small_cards} - But hey, every dollar counts! "
+        # Biggest tier first
+        drama_context = "".join(
+            template.format(cards)
+            for template, cards in zip(reversed(_CARD_TIER_TEMPLATES), reversed(tiers))
+            if cards
+        )
         
         return f"{starter} {drama_context}What's your move, player? 🎯"
 
@@ -194,4 +258,5 @@ class BankerRAG:
         if isinstance(object_value, str):
             object_value = ValueAtom(object_value)
         self.metta.space().add_atom(E(S(relation_type), S(subject), object_value))
+        self._query_cache.clear()
         return f"Added {relation_type}: {subject} → {object_value}"
\ No newline at end of file
@@ -0,0 +1,244 @@
+import copy
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, FrozenSet, Hashable, Optional, Tuple
+
+_TOKEN_RE = re.compile(r"[a-z0-9']+")
+
+def normalize_message(message: str, message_lower: Optional[str] = None) -> str:
+    """Lowercase a message and strip punctuation/extra whitespace."""
+    if message_lower is None:
+        message_lower = message.lower()
+    return " ".join(_TOKEN_RE.findall(message_lower))
+
+# Words that flip a message's meaning; two messages only match fuzzily if they share them
+_NEGATION_TOKENS = frozenset({"no", "not", "never", "nope", "nah", "nothing", "none",
+                              "neither", "nor", "without", "cannot", "dont", "wont", "cant"})
+
+def _tokenize(normalized: str) -> Tuple[Tuple[str, ...], FrozenSet[str]]:
+    """Token sequence and negation words of a normalized message."""
+    tokens = tuple(normalized.split())
+    negations = frozenset(token for token in tokens
+                          if token in _NEGATION_TOKENS or token.endswith("n't"))
+    return tokens, negations
+
+def _is_subsequence(shorter: Tuple[str, ...], longer: Tuple[str, ...]) -> bool:
+    """True if every token of ``shorter`` appears in ``longer`` in the same order."""
+    remaining = iter(longer)
+    return all(token in remaining for token in shorter)
+
+def _similarity(tokens: Tuple[str, ...], cached_tokens: Tuple[str, ...]) -> float:
+    """Order-aware similarity: only messages differing by added/dropped words score above 0."""
+    shorter, longer = sorted((tokens, cached_tokens), key=len)
+    if not shorter or not _is_subsequence(shorter, longer):
+        return 0.0
+    return 2 * len(shorter) / (len(shorter) + len(longer))
+
+def _to_hashable(value: Any) -> Hashable:
+    """Turn JSON lists back into the tuples used for cache keys."""
+    if isinstance(value, list):
+        return tuple(_to_hashable(item) for item in value)
+    return value
+
+class LLMCache:
+    """In-memory LRU cache of banker responses.
+
+    Entries are grouped by a game-state key (cards, round, ...) so a hit can
+    only ever reuse a response produced for the same game state. Within a
+    state, lookups first try the normalized message exactly and then fall
+    back to the most similar cached message above a threshold. A fuzzy
+    match must keep the cached message's words in the same order, differ
+    only by added or dropped words and use the same negation words, so
+    "not ready for your offer" never reuses the reply to "ready for your
+    offer". Safe to share between worker threads.
+    """
+
+    def __init__(self, max_entries: int = 1024, similarity_threshold: float = 0.92):
+        self.max_entries = max_entries
+        self.similarity_threshold = similarity_threshold
+        self._entries: "OrderedDict[Tuple[Hashable, str], Any]" = OrderedDict()
+        self._tokens: Dict[Hashable, Dict[str, Tuple[Tuple[str, ...], FrozenSet[str]]]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def exact_get(self, key: Hashable, message: str, normalized: Optional[str] = None) -> Optional[Any]:
+        """Return the response cached for this exact (normalized) message.
+
+        ``normalized`` lets callers that look up and store the same message
+        pass normalize_message(message) once instead of on every call.
+        """
+        entry_key = (key, normalized if normalized is not None else normalize_message(message))
+        with self._lock:
+            if entry_key not in self._entries:
+                return None
+            self._entries.move_to_end(entry_key)
+            return copy.deepcopy(self._entries[entry_key])
+
+    def semantic_get(self, key: Hashable, message: str, threshold: Optional[float] = None,
+                     normalized: Optional[str] = None) -> Optional[Any]:
+        """Return the response cached for the most similar message, if close enough."""
+        if threshold is None:
+            threshold = self.similarity_threshold
+        tokens, negations = _tokenize(normalized if normalized is not None else normalize_message(message))
+        if not tokens:
+            return None
+
+        with self._lock:
+            candidates = self._tokens.get(key)
+            if not candidates:
+                return None
+
+            best_message, best_score = None, threshold
+            for cached_message, (cached_tokens, cached_negations) in candidates.items():
+                if cached_negations != negations:
+                    continue
+                score = _similarity(tokens, cached_tokens)
+                if score >= best_score:
+                    best_message, best_score = cached_message, score
+
+            if best_message is None:
+                return None
+            entry_key = (key, best_message)
+            self._entries.move_to_end(entry_key)
+            return copy.deepcopy(self._entries[entry_key])
+
+    def put(self, key: Hashable, message: str, response: Any, normalized: Optional[str] = None):
+        """Cache a response, evicting the least recently used entry when full."""
+        if normalized is None:
+            normalized = normalize_message(message)
+        tokenized = _tokenize(normalized)
+        entry_key = (key, normalized)
+        response = copy.deepcopy(response)
+
+        with self._lock:
+            self._entries[entry_key] = response
+            self._entries.move_to_end(entry_key)
+            self._tokens.setdefault(key, {})[normalized] = tokenized
+
+            while len(self._entries) > self.max_entries:
+                (old_key, old_message), _ = self._entries.popitem(last=False)
+                state_tokens = self._tokens.get(old_key)
+                if state_tokens is not None:
+                    state_tokens.pop(old_message, None)
+                    if not state_tokens:
+                        del self._tokens[old_key]
+
+    def save(self, path: str):
+        """Write the cache to a JSON file so another process can load it."""
+        with self._lock:
+            entries = [[key, message, response] for (key, message), response in self._entries.items()]
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(entries, f)
+        os.replace(tmp_path, path)
+
+    def load(self, path: str) -> int:
+        """Add entries saved by save(); returns how many were loaded.
+
+        The cache is only an optimization, so an unreadable or corrupt file
+        is reported and skipped rather than raised.
+        """
+        if not os.path.exists(path):
+            return 0
+        try:
+            with open(path) as f:
+                saved = json.load(f)
+            if not isinstance(saved, list) or not all(
+                isinstance(entry, list) and len(entry) == 3 and isinstance(entry[1], str)
+                for entry in saved
+            ):
+                raise ValueError("expected a list of [key, message, response] entries")
+            entries = [(_to_hashable(key), message, response) for key, message, response in saved]
+        except (OSError, ValueError) as e:
+            print(f"Warning: ignoring unreadable response cache {path}: {e}")
+            return 0
+        for key, message, response in entries:
+            self.put(key, message, response, normalized=message)
+        return len(entries)
+
+    def clear(self):
+        """Drop every cached response."""
+        with self._lock:
+            self._entries.clear()
+            self._tokens.clear()
+
+class CachedLLM:
+    """Wrap an LLM so short, repeated completions are answered from memory.
+
+    Only calls with max_tokens <= max_cached_tokens are cached: these are
+    the one-word classifications (e.g. OFFER / CONVERSATION) whose answer
+    is fully determined by the prompt. Longer, creative replies always go
+    to the wrapped LLM. Matching is on the exact system prompt and prompt,
+    kept in a plain LRU rather than an LLMCache: near-match reuse would be
+    unsafe here because the shared template dominates any similarity score
+    between two prompts.
+    """
+
+    def __init__(self, llm: Any, max_cached_tokens: int = 10, max_entries: int = 1024):
+        self.llm = llm
+        self.max_cached_tokens = max_cached_tokens
+        self.max_entries = max_entries
+        # Completions are immutable strings, so they are stored and returned as is
+        self._completions: "OrderedDict[Hashable, str]" = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0}
+        self._lock = threading.Lock()
+
+    def _key(self, prompt, max_tokens, system, stop, response_format) -> Optional[Hashable]:
+        if max_tokens > self.max_cached_tokens:
+            return None
+        return (
+            system,
+            max_tokens,
+            tuple(stop) if stop else None,
+            json.dumps(response_format, sort_keys=True) if response_format else None,
+            prompt,
+        )
+
+    def _lookup(self, key: Optional[Hashable]) -> Optional[str]:
+        if key is None:
+            return None
+        with self._lock:
+            response = self._completions.get(key)
+            if response is not None:
+                self._completions.move_to_end(key)
+            self.stats["hits" if response is not None else "misses"] += 1
+        return response
+
+    def _store(self, key: Optional[Hashable], response: str):
+        if key is None:
+            return
+        with self._lock:
+            self._completions[key] = response
+            self._completions.move_to_end(key)
+            while len(self._completions) > self.max_entries:
+                self._completions.popitem(last=False)
+
+    def create_completion(self, prompt, max_tokens=200, system=None, stop=None,
+                          response_format=None):
+        key = self._key(prompt, max_tokens, system, stop, response_format)
+        response = self._lookup(key)
+        if response is None:
+            response = self.llm.create_completion(prompt, max_tokens=max_tokens, system=system,
+                                                  stop=stop, response_format=response_format)
+            self._store(key, response)
+        return response
+
+    async def acreate_completion(self, prompt, max_tokens=200, system=None, stop=None,
+                                 response_format=None):
+        key = self._key(prompt, max_tokens, system, stop, response_format)
+        response = self._lookup(key)
+        if response is None:
+            response = await self.llm.acreate_completion(prompt, max_tokens=max_tokens, system=system,
+                                                         stop=stop, response_format=response_format)
+            self._store(key, response)
+        return response
+
+    def stream_completion(self, prompt, max_tokens=200, system=None, stop=None,
+                          response_format=None):
+        return self.llm.stream_completion(prompt, max_tokens=max_tokens, system=system,
+                                          stop=stop, response_format=response_format)
@@ -0,0 +1,42 @@
+import atexit
+import os
+from functools import lru_cache
+from hyperon import MeTTa
+
+from .banker_rag import BankerRAG
+from .knowledge import BANKER_FACT_VALUES, initialize_banker_knowledge
+from .llm_cache import LLMCache
+from .utils import LLM
+
+# Process-wide instances shared by agent.py and banker_api_server.py, built on first use
+
+@lru_cache(maxsize=1)
+def get_rag() -> BankerRAG:
+    """MeTTa knowledge base and RAG wrapper, loaded and warmed once."""
+    metta = MeTTa()
+    initialize_banker_knowledge(metta)
+    rag = BankerRAG(metta, facts=BANKER_FACT_VALUES)
+    rag.warm_cache()
+    return rag
+
+@lru_cache(maxsize=1)
+def get_llm() -> LLM:
+    """LLM client for the ASI:One API.
+
+    Not wrapped in CachedLLM: the servers' async turns never make the short
+    classification calls it caches.
+    """
+    return LLM(api_key=os.getenv("ASI_ONE_API_KEY"))
+
+@lru_cache(maxsize=1)
+def get_response_cache() -> LLMCache:
+    """Banker response cache, so both entry points reuse each other's answers.
+
+    Set BANKER_CACHE_PATH to keep the cache on disk between runs.
+    """
+    cache = LLMCache()
+    path = os.getenv("BANKER_CACHE_PATH")
+    if path:
+        cache.load(path)
+        atexit.register(cache.save, path)
+    return cache
@@ -1,36 +1,183 @@
 import json
-from typing import List, Dict, Any, Optional
-from openai import OpenAI
+import re
+from functools import lru_cache
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, OpenAI, DefaultHttpxClient
 from .banker_rag import BankerRAG
+from .llm_cache import LLMCache, normalize_message
+
+try:
+    import h2  # noqa: F401  (httpx needs it for HTTP/2)
+    _HTTP2 = True
+except ImportError:
+    _HTTP2 = False
+
+try:
+    # orjson is optional; its decode errors subclass json.JSONDecodeError
+    from orjson import loads as json_loads
+except ImportError:
+    json_loads = json.loads
+
+@lru_cache(maxsize=256)
+def _parse_json_reply(response: str) -> Any:
+    """Parse an LLM JSON reply once per distinct reply string.
+
+    The result is shared between callers, so treat it as read-only.
+    """
+    return json_loads(response)
+
+_CARDS_RE = re.compile(r'remaining cards?:\s*\[([^\]]+)\]', re.IGNORECASE)
+_ROUND_RE = re.compile(r'round\s+(\d+)', re.IGNORECASE)
+
+# Deal phrases are matched as plain substrings of the lowercased message
+DEAL_ACCEPT_PHRASES = ["accept", "yes", "take it", "i'll take it", "agreed", "i accept", "deal accepted", "take the deal"]
+DEAL_REJECT_PHRASES = ["no deal", "reject", "pass", "no thanks", "decline", "not interested"]
+# One zero-width scan finds every phrase occurrence, overlapping ones included,
+# so both lists are checked in a single pass over the message.
+_DEAL_PHRASE_RE = re.compile(
+    "(?=(?:(?P<reject>" + "|".join(re.escape(phrase) for phrase in DEAL_REJECT_PHRASES) + ")"
+    "|(?P<accept>" + "|".join(re.escape(phrase) for phrase in DEAL_ACCEPT_PHRASES) + ")))"
+)
+
+# Messages that plainly ask for money or plainly just chat are classified
+# locally; only ambiguous ones go to the LLM.
+_OFFER_KEYWORD_RE = re.compile(
+    r"\$|\b(?:offer|deal|money|negotiate|accept|reject|price|amount|give me|how much)\b", re.IGNORECASE
+)
+_CHAT_KEYWORD_RE = re.compile(r"\b(?:hi|hello|hey|thanks|thank you|cool|nice|wow)\b", re.IGNORECASE)
+
+# Whole-word keywords for should_make_offer
+OFFER_TOKENS = frozenset({"offer", "deal", "money", "negotiate", "price", "continue", "next", "play"})
+CONV_TOKENS = frozenset({"hello", "hi", "hey", "thanks", "cool", "wow", "nice", "okay", "sure", "maybe"})
+_WORD_RE = re.compile(r"[a-z]+")
+
+_http_client: Optional[httpx.Client] = None
+_async_http_client: Optional[httpx.AsyncClient] = None
+_POOL_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+
+def get_http_client() -> httpx.Client:
+    """Connection pool shared by every LLM so TLS sessions are reused across calls."""
+    global _http_client
+    if _http_client is None:
+        _http_client = DefaultHttpxClient(
+            http2=_HTTP2,
+            limits=_POOL_LIMITS
+        )
+    return _http_client
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """Async counterpart of get_http_client() for AsyncOpenAI."""
+    global _async_http_client
+    if _async_http_client is None:
+        _async_http_client = DefaultAsyncHttpxClient(
+            http2=_HTTP2,
+            limits=_POOL_LIMITS
+        )
+    return _async_http_client
+
+ASI_BASE_URL = "https://api.asi1.ai/v1"
+
+_api_clients: Dict[Tuple[str, str], Tuple[OpenAI, AsyncOpenAI]] = {}
+
+def get_api_clients(api_key: str, base_url: str = ASI_BASE_URL) -> Tuple[OpenAI, AsyncOpenAI]:
+    """Sync and async API clients, built once per (api_key, base_url)."""
+    key = (api_key, base_url)
+    clients = _api_clients.get(key)
+    if clients is None:
+        clients = (
+            OpenAI(
+                api_key=api_key,
+                base_url=base_url,
+                http_client=get_http_client()
+            ),
+            AsyncOpenAI(
+                api_key=api_key,
+                base_url=base_url,
+                http_client=get_async_http_client()
+            )
+        )
+        _api_clients[key] = clients
+    return clients
 
 class LLM:
-    def __init__(self, api_key):
-        self.client = OpenAI(
-            api_key=api_key,
-            base_url="https://api.asi1.ai/v1"
+    def __init__(self, api_key, base_url=ASI_BASE_URL):
+        self.client, self.async_client = get_api_clients(api_key, base_url)
+
+    def _messages(self, prompt, system=None):
+        messages = [{"role": "user", "content": prompt}]
+        if system:
+            # Static instructions first so repeated calls share a cacheable prefix
+            messages.insert(0, {"role": "system", "content": system})
+        return messages
+
+    @staticmethod
+    def _options(stop=None, response_format=None):
+        # Only send optional parameters that were set; some endpoints reject nulls
+        options = {}
+        if stop:
+            options["stop"] = stop
+        if response_format:
+            options["response_format"] = response_format
+        return options
+
+    def create_completion(self, prompt, max_tokens=200, system=None, stop=None,
+                          response_format=None):
+        completion = self.client.chat.completions.create(
+            messages=self._messages(prompt, system),
+            model="asi1-mini",
+            max_tokens=max_tokens,
+            **self._options(stop, response_format)
         )
+        return completion.choices[0].message.content
 
-    def create_completion(self, prompt, max_tokens=200):
-        completion = self.client.chat.completions.create(
-            messages=[{"role": "user", "content": prompt}],
+    async def acreate_completion(self, prompt, max_tokens=200, system=None, stop=None,
+                                 response_format=None):
+        completion = await self.async_client.chat.completions.create(
+            messages=self._messages(prompt, system),
             model="asi1-mini",
-            max_tokens=max_tokens
+            max_tokens=max_tokens,
+            **self._options(stop, response_format)
         )
         return completion.choices[0].message.content
 
-def analyze_user_sentiment(user_message: str, llm: LLM) -> str:
-    """Analyze user message to determine sentiment using LLM."""
-    prompt = (
-        f"Analyze the sentiment of this message: '{user_message}'\n"
-        "Classify as one of: 'confident', 'desperate', 'aggressive', or 'neutral'.\n"
-        "Return *only* the classification word, no additional text."
-    )
-    response = llm.create_completion(prompt, max_tokens=10)
-    return response.strip().lower()
+    def stream_completion(self, prompt, max_tokens=200, system=None, stop=None,
+                          response_format=None) -> Iterator[str]:
+        """Yield the completion text as it arrives instead of waiting for all of it."""
+        stream = self.client.chat.completions.create(
+            messages=self._messages(prompt, system),
+            model="asi1-mini",
+            max_tokens=max_tokens,
+            stream=True,
+            **self._options(stop, response_format)
+        )
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+# Ask for a JSON object wherever the prompt's schema is JSON
+JSON_RESPONSE_FORMAT = {"type": "json_object"}
+
+# Static banker instructions are sent as a byte-identical system message on
+# every call so the provider can reuse its cached prefix; only the per-turn
+# game state goes in the user message.
+BANKER_OFFER_SYSTEM_PROMPT = """
+You are The Banker in a Deal or No Deal game: a witty, confident, slightly mischievous negotiator who reads players and pushes them toward a decision. Speak casually, with contractions and direct questions.
+
+Adapt to the player's vibe:
+- confident: tease them and challenge them to handle the pressure
+- desperate: sound generous but firm; urge them to take the offer while they can
+- aggressive: stay calm, refuse to be pushed, call it your final offer
+
+Rules:
+- 2-4 sentences; state your calculated offer (never above $165)
+- Reference specific remaining boxes, and use a quick story, rhetorical question or urgency for drama
+- At most a couple of emojis
+
+Reply with JSON only: {"message": "<your negotiation line>", "offer": <number>}
+"""
 
-def generate_banker_response(offer_data: Dict[str, Any], user_message: str, llm: LLM, rag: BankerRAG) -> Dict[str, Any]:
-    """Generate banker's negotiation response using LLM."""
-    
+def _offer_prompt(offer_data: Dict[str, Any], user_message: str, rag: BankerRAG) -> str:
     # Create engaging context with drama
     engaging_context = rag.create_engaging_context(
         offer_data['cardsRemaining'], 
@@ -38,17 +185,8 @@ def generate_banker_response(offer_data: Dict[str, Any], user_message: str, llm:
         offer_data['sentiment']
     )
     
-    # Create context for the LLM
-    context = f"""
-You are "The Banker" - a legendary figure in the high-stakes world of Deal or No Deal! 🎰 You're not just any banker; you're a master of psychology, a wizard of words, and a connoisseur of human nature. Think of yourself as a cross between a Vegas casino boss, a smooth-talking game show host, and that one friend who always knows exactly what to say to get people to do what you want.
-
-Your Character:
-🎭 **Persona**: You're the witty, slightly mischievous mastermind who's seen it all. You've watched thousands of players crumble under pressure, and you know every trick in the book. You're confident, charming, and have a dry sense of humor that keeps players on their toes.
-
-🗣️ **Voice**: Talk like you're chatting with a friend over drinks, but one who happens to control millions of dollars. Use contractions ("it's", "you'll", "I'm"), ask direct questions, and keep things conversational. You're not stuffy or formal - you're the cool banker everyone wants to hang out with.
-
-🎯 **Psychology**: You're a master manipulator (in the best way!). You read people like open books and know exactly which buttons to push. You can sense desperation from a mile away, spot overconfidence before it even shows, and you're not afraid to play hardball when needed.
-
+    # Only the per-turn game state goes in the user message
+    return f"""
 Current Game State:
 - Remaining boxes: {offer_data['cardsRemaining']}
 - Round: {offer_data['round']}
@@ -58,44 +196,15 @@ Current Game State:
 - House edge: {offer_data['houseEdge']}
 - Drama context: {engaging_context}
 
-Your Negotiation Playbook:
-🎪 **For Confident Players**: "Oh, you think you're hot stuff, do you? Well, let's see if you can handle the pressure when those big numbers start disappearing! I'll give you ${offer_data['offer']} to walk away now... but I have a feeling you're going to be stubborn about this."
-
-😰 **For Desperate Players**: "I can see the sweat on your brow, my friend. The house doesn't give handouts, but I'll tell you what - I'm feeling generous today. ${offer_data['offer']} is more than fair given what's left on the table. Take it while you can."
-
-😤 **For Aggressive Players**: "Whoa there, tiger! I've been doing this longer than you've been alive, and I don't respond well to threats. ${offer_data['offer']} is my final offer. Take it or leave it - but remember, the house always wins."
-
-🎲 **General Tactics**:
-- Reference specific remaining boxes to build drama ("That $75 is still out there...")
-- Use storytelling ("I once had a player who turned down $50 and walked away with $1...")
-- Ask rhetorical questions ("Are you feeling lucky today?")
-- Create urgency ("This offer won't last forever...")
-- Use humor and wit to disarm tension
-- Remember: Maximum offer is $165!
-
-Response Rules:
-- Keep it to 2-4 sentences max
-- Be conversational and engaging
-- Use emojis sparingly but effectively
-- Reference specific cards for drama
-- Ask questions to keep them engaged
-- Show your personality - be memorable!
-
-Always respond in JSON format:
-{{
-  "message": "Your witty, engaging negotiation line",
-  "offer": <number>
-}}
-
 Player just said: "{user_message}"
 """
 
-    response = llm.create_completion(context, max_tokens=400)
-    
+def _parse_offer_reply(response: str, offer_data: Dict[str, Any]) -> Dict[str, Any]:
     try:
-        # Try to parse JSON response
-        result = json.loads(response)
-        return result
+        # JSON mode makes this parse reliable; the fallback covers endpoints that ignore it
+        result = _parse_json_reply(response)
+        # Copy so callers can't change the cached parse
+        return dict(result) if isinstance(result, dict) else result
     except json.JSONDecodeError:
         # Fallback if JSON parsing fails
         return {
@@ -103,17 +212,24 @@ Player just said: "{user_message}"
             "offer": offer_data['offer']
         }
 
-def ai_decide_response_type(user_message: str, llm: LLM, remaining_boxes: List[int], round_num: int) -> str:
-    """Let the AI decide whether to make an offer or just have a conversation."""
-    
-    context = f"""
+def generate_banker_response(offer_data: Dict[str, Any], user_message: str, llm: LLM, rag: BankerRAG) -> Dict[str, Any]:
+    """Generate banker's negotiation response using LLM."""
+    context = _offer_prompt(offer_data, user_message, rag)
+    response = llm.create_completion(context, max_tokens=400, system=BANKER_OFFER_SYSTEM_PROMPT,
+                                     response_format=JSON_RESPONSE_FORMAT)
+    return _parse_offer_reply(response, offer_data)
+
+async def agenerate_banker_response(offer_data: Dict[str, Any], user_message: str, llm: LLM,
+                                    rag: BankerRAG) -> Dict[str, Any]:
+    """Async version of generate_banker_response."""
+    context = _offer_prompt(offer_data, user_message, rag)
+    response = await llm.acreate_completion(context, max_tokens=400, system=BANKER_OFFER_SYSTEM_PROMPT,
+                                            response_format=JSON_RESPONSE_FORMAT)
+    return _parse_offer_reply(response, offer_data)
+
+BANKER_DECISION_SYSTEM_PROMPT = """
 You are a charismatic Banker in a Deal-or-No-Deal style game. You need to decide how to respond to the player's message.
 
-Context:
-- Remaining boxes in play: {remaining_boxes}
-- Round number: {round_num}
-- Player's message: "{user_message}"
-
 You must decide whether to:
 1. Make a formal offer (when player is ready to negotiate, asking for money, or it's time for a new round)
 2. Just have a casual conversation (when player is greeting, chatting, or not ready to negotiate)
@@ -124,109 +240,352 @@ Consider these factors:
 - If it's early in the game and player seems unsure → CONVERSATION
 - If player is being aggressive or demanding → OFFER
 - If player is just expressing emotions or thoughts → CONVERSATION
+"""
+
+DECISION_STOP_SEQUENCES = ["\n", "."]
+
+def local_response_type(user_message: str) -> Optional[str]:
+    """Classify obvious messages by keyword; None means the LLM should decide.
+
+    A message with both kinds of keyword ("thanks for the offer") is
+    ambiguous and left to the LLM, as is one with neither.
+    """
+    wants_offer = _OFFER_KEYWORD_RE.search(user_message) is not None
+    chatting = _CHAT_KEYWORD_RE.search(user_message) is not None
+    if wants_offer == chatting:
+        return None
+    return "OFFER" if wants_offer else "CONVERSATION"
+
+def should_make_offer(user_message: str, message_lower: Optional[str] = None) -> bool:
+    """Whether a message asks for an offer: an offer word and no small-talk word."""
+    if message_lower is None:
+        message_lower = user_message.lower()
+    tokens = set(_WORD_RE.findall(message_lower))
+    return not tokens.isdisjoint(OFFER_TOKENS) and tokens.isdisjoint(CONV_TOKENS)
+
+def _decision_prompt(user_message: str, remaining_boxes: List[int], round_num: int) -> str:
+    return f"""
+Context:
+- Remaining boxes in play: {remaining_boxes}
+- Round number: {round_num}
+- Player's message: "{user_message}"
 
 Respond with ONLY one word: either "OFFER" or "CONVERSATION"
 """
+
+def _parse_decision(response: str, user_message: str) -> str:
+    decision = response.strip().strip("'\"").upper()
     
-    response = llm.create_completion(context, max_tokens=10)
-    decision = response.strip().upper()
-    
-    # Fallback to conversation if AI response is unclear
-    if decision not in ["OFFER", "CONVERSATION"]:
-        decision = "CONVERSATION"
+    # Match on the prefix in case the word was cut at the token limit;
+    # fall back to conversation if AI response is unclear
+    decision = "OFFER" if decision.startswith("OFF") else "CONVERSATION"
     
     print(f"AI decided response type: {decision} for message: '{user_message}'")
     return decision
 
-def generate_conversational_response(user_message: str, rag: BankerRAG, llm: LLM, 
-                                   remaining_boxes: List[int], round_num: int) -> str:
-    """Generate a conversational response without making an offer."""
+def _local_decision(user_message: str) -> Optional[str]:
+    decision = local_response_type(user_message)
+    if decision is not None:
+        print(f"Locally decided response type: {decision} for message: '{user_message}'")
+    return decision
+
+def ai_decide_response_type(user_message: str, llm: LLM, remaining_boxes: List[int], round_num: int) -> str:
+    """Let the AI decide whether to make an offer or just have a conversation."""
     
-    # Create engaging context
-    engaging_context = rag.create_engaging_context(remaining_boxes, round_num, "neutral")
+    decision = _local_decision(user_message)
+    if decision is not None:
+        return decision
     
-    context = f"""
-You are "The Banker" - the legendary master of the Deal or No Deal universe! 🎰 You're not just any banker; you're a charismatic storyteller, a psychological genius, and the coolest person in the room. Think of yourself as that friend who always has the best stories and knows exactly how to make any situation more interesting.
+    # Both words fit in three tokens; the stop sequences cut off any trailing prose
+    response = llm.create_completion(_decision_prompt(user_message, remaining_boxes, round_num),
+                                     max_tokens=3, system=BANKER_DECISION_SYSTEM_PROMPT,
+                                     stop=DECISION_STOP_SEQUENCES)
+    return _parse_decision(response, user_message)
+
+async def ai_decide_response_type_async(user_message: str, llm: LLM, remaining_boxes: List[int],
+                                        round_num: int) -> str:
+    """Async version of ai_decide_response_type, so many decisions can be awaited together."""
+    
+    decision = _local_decision(user_message)
+    if decision is not None:
+        return decision
+    
+    response = await llm.acreate_completion(_decision_prompt(user_message, remaining_boxes, round_num),
+                                            max_tokens=3, system=BANKER_DECISION_SYSTEM_PROMPT,
+                                            stop=DECISION_STOP_SEQUENCES)
+    return _parse_decision(response, user_message)
+
+def _decision_batch_prompt(user_messages: List[str], remaining_boxes: List[int], round_num: int) -> str:
+    numbered = "\n".join(f'{i}. "{message}"' for i, message in enumerate(user_messages, 1))
+    return f"""
+Context:
+- Remaining boxes in play: {remaining_boxes}
+- Round number: {round_num}
 
-Your Character:
-🎭 **Persona**: You're witty, charming, and slightly mischievous. You've seen thousands of players come and go, and you have stories for days. You're confident, engaging, and you know how to work a crowd like nobody's business.
+Player's messages:
+{numbered}
 
-🗣️ **Voice**: Talk like you're having a casual conversation with a friend, but one who happens to be sitting on a fortune. Use contractions, ask questions, and keep things light and engaging. You're not stuffy or formal - you're the banker everyone wants to hang out with.
+Respond with JSON only: {{"decisions": [...]}} holding "OFFER" or "CONVERSATION" for each message, in order
+"""
 
-🎯 **Psychology**: You're a master of reading people and situations. You know when to build tension, when to ease it, and how to keep players engaged without overwhelming them. You use humor, storytelling, and charm to create memorable moments.
+def ai_decide_response_type_batch(user_messages: List[str], llm: LLM, remaining_boxes: List[int],
+                                  round_num: int) -> List[str]:
+    """Decide the response type for several messages with at most one LLM call.
+
+    Obvious messages are decided locally; the rest share one prompt that
+    asks for a JSON list of decisions. Missing or unclear entries fall
+    back to conversation, as in ai_decide_response_type.
+    """
+    decisions = [_local_decision(message) for message in user_messages]
+    pending = [i for i, decision in enumerate(decisions) if decision is None]
+    if not pending:
+        return decisions
+    
+    prompt = _decision_batch_prompt([user_messages[i] for i in pending], remaining_boxes, round_num)
+    response = llm.create_completion(prompt, max_tokens=10 * len(pending) + 10,
+                                     system=BANKER_DECISION_SYSTEM_PROMPT,
+                                     response_format=JSON_RESPONSE_FORMAT)
+    try:
+        replies = _parse_json_reply(response)["decisions"]
+    except (json.JSONDecodeError, KeyError, TypeError):
+        replies = []
+    if not isinstance(replies, list):
+        replies = []
+    
+    for position, i in enumerate(pending):
+        reply = replies[position] if position < len(replies) else ""
+        decisions[i] = _parse_decision(str(reply), user_messages[i])
+    return decisions
+
+BANKER_CONVERSATION_SYSTEM_PROMPT = """
+You are The Banker in a Deal or No Deal game: a witty, charming storyteller who has seen thousands of players and loves the psychology of the game. Speak casually, like a friend sitting on a fortune.
+
+Rules:
+- 1-3 sentences of engaging chat; never make an offer or mention amounts you'd pay
+- Build excitement with humor, a short story, or a question about how the player feels
+- Reference specific remaining boxes for drama
+- At most a couple of emojis
+"""
 
+def _conversation_prompt(user_message: str, rag: BankerRAG,
+                         remaining_boxes: List[int], round_num: int) -> str:
+    # Create engaging context
+    engaging_context = rag.create_engaging_context(remaining_boxes, round_num, "neutral")
+    
+    return f"""
 Current Situation:
 - Remaining boxes: {remaining_boxes}
 - Round: {round_num}
 - Context: {engaging_context}
 
-Your Conversational Arsenal:
-📚 **Storytelling**: "You know, I had a player last week who was in your exact position... they had the same boxes, same round, everything. Want to know what happened to them?"
+Player just said: "{user_message}"
 
-🎪 **Drama Building**: "Look at those numbers still out there... that $75 is just sitting there, waiting for someone brave enough to go for it."
+Respond conversationally (no offers, just engaging chat):
+"""
 
-😄 **Humor & Wit**: "Well, well, well... look who's back! I was starting to think you'd run off with my money and left me here talking to myself!"
+def generate_conversational_response(user_message: str, rag: BankerRAG, llm: LLM, 
+                                   remaining_boxes: List[int], round_num: int) -> str:
+    """Generate a conversational response without making an offer."""
+    context = _conversation_prompt(user_message, rag, remaining_boxes, round_num)
+    response = llm.create_completion(context, max_tokens=200, system=BANKER_CONVERSATION_SYSTEM_PROMPT)
+    return response.strip()
 
-🤔 **Engaging Questions**: "Tell me, what's going through your mind right now? Are you feeling lucky, or are you starting to second-guess yourself?"
+async def agenerate_conversational_response(user_message: str, rag: BankerRAG, llm: LLM,
+                                            remaining_boxes: List[int], round_num: int) -> str:
+    """Async version of generate_conversational_response."""
+    context = _conversation_prompt(user_message, rag, remaining_boxes, round_num)
+    response = await llm.acreate_completion(context, max_tokens=200, system=BANKER_CONVERSATION_SYSTEM_PROMPT)
+    return response.strip()
 
-🎯 **Psychological Play**: "I can see the wheels turning in your head... that's what I love about this game - it's not just about the money, it's about the psychology."
+def stream_conversational_response(user_message: str, rag: BankerRAG, llm: LLM,
+                                   remaining_boxes: List[int], round_num: int) -> Iterator[str]:
+    """Like generate_conversational_response, but yield the reply as it is generated.
 
-Response Guidelines:
-- Keep it to 1-3 sentences max
-- Be conversational and engaging
-- Use humor and wit when appropriate
-- Ask questions to keep them engaged
-- Reference specific boxes for drama
-- Tell stories when they fit
-- Show your personality - be memorable!
-- Don't make any offers, just chat and build excitement
+    The reply is plain text, so chunks can be shown as they arrive; joined
+    together they match generate_conversational_response() before its strip().
+    """
+    context = _conversation_prompt(user_message, rag, remaining_boxes, round_num)
+    yield from llm.stream_completion(context, max_tokens=200, system=BANKER_CONVERSATION_SYSTEM_PROMPT)
 
-Player just said: "{user_message}"
+BANKER_TURN_SYSTEM_PROMPT = """
+You are The Banker in a Deal or No Deal game: witty, charming, slightly mischievous, and a master of psychology. Speak casually, with contractions, direct questions and drama around the remaining boxes.
 
-Respond conversationally (no offers, just engaging chat):
+For each player message, decide how to respond and write the reply:
+- CONVERSATION when the player greets, makes small talk, seems unsure early on, or just shares feelings: 1-3 sentences of chat, no offers or amounts
+- OFFER when the player asks for money or an offer, wants to negotiate, or is aggressive: 2-4 sentences presenting your calculated offer (never above $165) and pushing for a decision
+- At most a couple of emojis
+
+Reply with JSON only: {"decision": "OFFER" or "CONVERSATION", "message": "<your reply>"}
 """
+
+def _banker_turn_prompt(user_message: str, rag: BankerRAG, offer_data: Dict[str, Any]) -> str:
+    engaging_context = rag.create_engaging_context(
+        offer_data['cardsRemaining'],
+        offer_data['round'],
+        offer_data['sentiment']
+    )
+
+    return f"""
+Current Game State:
+- Remaining boxes: {offer_data['cardsRemaining']}
+- Round: {offer_data['round']}
+- Expected Value: ${offer_data['expectedValue']}
+- Your calculated offer, if you make one: ${offer_data['offer']} (max $165)
+- Player's vibe: {offer_data['sentiment']}
+- Drama context: {engaging_context}
+
+Player just said: "{user_message}"
+"""
+
+def _parse_banker_turn(response: str) -> Dict[str, str]:
+    try:
+        result = _parse_json_reply(response)
+        decision = str(result.get("decision", "")).strip().upper()
+        message = result["message"]
+    except (json.JSONDecodeError, AttributeError, KeyError, TypeError):
+        # Unparseable replies are treated as plain conversation
+        return {"decision": "CONVERSATION", "message": response.strip()}
+
+    if decision not in ["OFFER", "CONVERSATION"]:
+        decision = "CONVERSATION"
+    return {"decision": decision, "message": message}
+
+def generate_banker_turn(user_message: str, llm: LLM, rag: BankerRAG,
+                         offer_data: Dict[str, Any]) -> Dict[str, str]:
+    """Decide between an offer and a chat and write the reply with one LLM call."""
+    context = _banker_turn_prompt(user_message, rag, offer_data)
+    response = llm.create_completion(context, max_tokens=400, system=BANKER_TURN_SYSTEM_PROMPT,
+                                     response_format=JSON_RESPONSE_FORMAT)
+    return _parse_banker_turn(response)
+
+async def agenerate_banker_turn(user_message: str, llm: LLM, rag: BankerRAG,
+                                offer_data: Dict[str, Any]) -> Dict[str, str]:
+    """Async version of generate_banker_turn."""
+    context = _banker_turn_prompt(user_message, rag, offer_data)
+    response = await llm.acreate_completion(context, max_tokens=400, system=BANKER_TURN_SYSTEM_PROMPT,
+                                            response_format=JSON_RESPONSE_FORMAT)
+    return _parse_banker_turn(response)
+
+def _offer_result(round_num: int, remaining_boxes: List[int], offer_data: Dict[str, Any],
+                  message: str, sentiment: str) -> Dict[str, Any]:
+    return {
+        "selected_question": f"Banker's offer for Round {round_num}",
+        "humanized_answer": message,
+        "offer": offer_data['offer'],
+        "game_state": {
+            "round": round_num,
+            "remaining_boxes": remaining_boxes,
+            "expected_value": offer_data['expectedValue'],
+            "house_edge": offer_data['houseEdge'],
+            "sentiment": sentiment
+        }
+    }
+
+def _conversation_result(round_num: int, remaining_boxes: List[int], message: str) -> Dict[str, Any]:
+    return {
+        "selected_question": "Banker's conversation",
+        "humanized_answer": message,
+        "offer": None,  # No offer made
+        "game_state": {
+            "round": round_num,
+            "remaining_boxes": remaining_boxes,
+            "expected_value": None,
+            "house_edge": None,
+            "sentiment": "conversational"
+        }
+    }
+
+def _cache_lookup(cache: Optional[LLMCache], rag: BankerRAG, user_message: str, message_lower: str,
+                  remaining_boxes: List[int], burnt_boxes: List[int], round_num: int):
+    """Return (cache_key, normalized message, cached response or None).
+
+    The player's sentiment is part of the key: it sets the offer multiplier,
+    so a near-identical message with a different vibe ("... please") must
+    not reuse the other message's offer.
+    """
+    if cache is None:
+        return None, None, None
+    cache_key = (tuple(sorted(remaining_boxes)), tuple(sorted(burnt_boxes)), round_num,
+                 rag.analyze_user_behavior(user_message, message_lower))
+    normalized = normalize_message(user_message, message_lower)
+    cached = cache.exact_get(cache_key, user_message, normalized=normalized)
+    if cached is None:
+        cached = cache.semantic_get(cache_key, user_message, normalized=normalized)
+    if cached is not None and cached['offer'] is not None:
+        rag.update_game_state(round_num, remaining_boxes, burnt_boxes, cached['offer'])
+    return cache_key, normalized, cached
+
+def _prepare_banker_turn(user_message: str, message_lower: str, rag: BankerRAG,
+                         remaining_boxes: List[int], round_num: int):
+    # Sentiment and the offer are local MeTTa work, so compute them up front
+    # and let a single LLM call pick the response type and write the reply
+    sentiment = rag.analyze_user_behavior(user_message, message_lower)
+    return sentiment, rag.calculate_base_offer(remaining_boxes, round_num, sentiment)
+
+def _banker_turn_result(turn: Dict[str, str], user_message: str, rag: BankerRAG,
+                        remaining_boxes: List[int], burnt_boxes: List[int], round_num: int,
+                        sentiment: str, offer_data: Dict[str, Any]) -> Dict[str, Any]:
+    if turn['decision'] == "OFFER":
+        rag.update_game_state(round_num, remaining_boxes, burnt_boxes, offer_data['offer'])
+        return _offer_result(round_num, remaining_boxes, offer_data, turn['message'], sentiment)
+    return _conversation_result(round_num, remaining_boxes, turn['message'])
+
+def _make_offer(user_message: str, message_lower: str, rag: BankerRAG, llm: LLM,
+                remaining_boxes: List[int], burnt_boxes: List[int], round_num: int) -> Dict[str, Any]:
+    # Analyze user sentiment
+    sentiment = rag.analyze_user_behavior(user_message, message_lower)
+    print(f"Player sentiment: {sentiment}")
     
-    response = llm.create_completion(context, max_tokens=200)
-    return response.strip()
+    # Calculate base offer using MeTTa rules
+    offer_data = rag.calculate_base_offer(remaining_boxes, round_num, sentiment)
+    print(f"Offer calculation: {offer_data}")
+    
+    # Update game state
+    rag.update_game_state(round_num, remaining_boxes, burnt_boxes, offer_data['offer'])
+    
+    # Generate banker response with offer
+    banker_response = generate_banker_response(offer_data, user_message, llm, rag)
+    
+    return _offer_result(round_num, remaining_boxes, offer_data, banker_response['message'], sentiment)
 
 def process_banker_query(user_message: str, rag: BankerRAG, llm: LLM, 
                         remaining_boxes: List[int], burnt_boxes: List[int], 
-                        round_num: int) -> Dict[str, Any]:
-    """Process banker negotiation query."""
+                        round_num: int, cache: Optional[LLMCache] = None,
+                        message_lower: Optional[str] = None, batched: bool = False) -> Dict[str, Any]:
+    """Process banker negotiation query.
+
+    When a cache is given, a response previously generated for the same game
+    state and the same (or a near-identical) message is reused instead of
+    calling the LLM again. Handlers that already lowercased the message can
+    pass it as ``message_lower`` so it is not lowercased again.
+
+    With ``batched=True`` the response type and the reply come from a single
+    LLM call instead of a decision call followed by a response call.
+    """
+    if message_lower is None:
+        message_lower = user_message.lower()
+    cache_key, normalized, cached = _cache_lookup(
+        cache, rag, user_message, message_lower, remaining_boxes, burnt_boxes, round_num
+    )
+    if cached is not None:
+        return cached
     
+    if batched:
+        sentiment, offer_data = _prepare_banker_turn(user_message, message_lower, rag, remaining_boxes, round_num)
+        turn = generate_banker_turn(user_message, llm, rag, offer_data)
+        print(f"AI decided response type: {turn['decision']} for message: '{user_message}'")
+        result = _banker_turn_result(turn, user_message, rag, remaining_boxes, burnt_boxes,
+                                     round_num, sentiment, offer_data)
+
+        if cache is not None:
+            cache.put(cache_key, user_message, result, normalized=normalized)
+        return result
+
     # Let the AI decide whether to make an offer or just chat
     response_type = ai_decide_response_type(user_message, llm, remaining_boxes, round_num)
     
     if response_type == "OFFER":
-        # Analyze user sentiment
-        sentiment = rag.analyze_user_behavior(user_message)
-        print(f"Player sentiment: {sentiment}")
-        
-        # Calculate base offer using MeTTa rules
-        offer_data = rag.calculate_base_offer(remaining_boxes, round_num, sentiment)
-        print(f"Offer calculation: {offer_data}")
-        
-        # Update game state
-        rag.update_game_state(round_num, remaining_boxes, burnt_boxes, offer_data['offer'])
-        
-        # Generate banker response with offer
-        banker_response = generate_banker_response(offer_data, user_message, llm, rag)
-        
-        # Ensure offer matches calculated offer
-        banker_response['offer'] = offer_data['offer']
-        
-        return {
-            "selected_question": f"Banker's offer for Round {round_num}",
-            "humanized_answer": banker_response['message'],
-            "offer": banker_response['offer'],
-            "game_state": {
-                "round": round_num,
-                "remaining_boxes": remaining_boxes,
-                "expected_value": offer_data['expectedValue'],
-                "house_edge": offer_data['houseEdge'],
-                "sentiment": sentiment
-            }
-        }
+        result = _make_offer(user_message, message_lower, rag, llm, remaining_boxes, burnt_boxes, round_num)
     else:
         # Just have a conversation without making an offer
         print(f"Having conversation with player: {user_message}")
@@ -234,27 +593,179 @@ def process_banker_query(user_message: str, rag: BankerRAG, llm: LLM,
         # Generate conversational response
         conversation_response = generate_conversational_response(user_message, rag, llm, remaining_boxes, round_num)
         
-        return {
-            "selected_question": "Banker's conversation",
-            "humanized_answer": conversation_response,
-            "offer": None,  # No offer made
-            "game_state": {
-                "round": round_num,
-                "remaining_boxes": remaining_boxes,
-                "expected_value": None,
-                "house_edge": None,
-                "sentiment": "conversational"
-            }
-        }
+        result = _conversation_result(round_num, remaining_boxes, conversation_response)
+    
+    if cache is not None:
+        cache.put(cache_key, user_message, result, normalized=normalized)
+    return result
+
+def process_banker_query_stream(user_message: str, rag: BankerRAG, llm: LLM,
+                                remaining_boxes: List[int], burnt_boxes: List[int],
+                                round_num: int, cache: Optional[LLMCache] = None,
+                                message_lower: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """Like process_banker_query, but yield the reply while it is generated.
+
+    Yields {"delta": text} events for the reply and then one
+    {"response": result} event holding what process_banker_query would
+    return. Conversational replies stream from the LLM as they are decoded;
+    an offer reply is JSON, so its message arrives as one delta once the
+    offer is known.
+    """
+    if message_lower is None:
+        message_lower = user_message.lower()
+    cache_key, normalized, cached = _cache_lookup(
+        cache, rag, user_message, message_lower, remaining_boxes, burnt_boxes, round_num
+    )
+    if cached is not None:
+        yield {"delta": cached['humanized_answer']}
+        yield {"response": cached}
+        return
+    
+    if ai_decide_response_type(user_message, llm, remaining_boxes, round_num) == "OFFER":
+        result = _make_offer(user_message, message_lower, rag, llm, remaining_boxes, burnt_boxes, round_num)
+        yield {"delta": result['humanized_answer']}
+    else:
+        print(f"Having conversation with player: {user_message}")
+        chunks = []
+        for chunk in stream_conversational_response(user_message, rag, llm, remaining_boxes, round_num):
+            chunks.append(chunk)
+            yield {"delta": chunk}
+        result = _conversation_result(round_num, remaining_boxes, "".join(chunks).strip())
+    
+    if cache is not None:
+        cache.put(cache_key, user_message, result, normalized=normalized)
+    yield {"response": result}
+
+async def aprocess_banker_query(user_message: str, rag: BankerRAG, llm: LLM,
+                                remaining_boxes: List[int], burnt_boxes: List[int],
+                                round_num: int, cache: Optional[LLMCache] = None,
+                                message_lower: Optional[str] = None) -> Dict[str, Any]:
+    """Async version of process_banker_query(..., batched=True).
+
+    The LLM call is awaited on the event loop instead of tying up a worker
+    thread, so many turns can be in flight at once. Messages whose keywords
+    settle the response type (see local_response_type) skip the batched
+    decision and go straight to the offer or conversation prompt.
+    """
+    if message_lower is None:
+        message_lower = user_message.lower()
+    cache_key, normalized, cached = _cache_lookup(
+        cache, rag, user_message, message_lower, remaining_boxes, burnt_boxes, round_num
+    )
+    if cached is not None:
+        return cached
+
+    sentiment, offer_data = _prepare_banker_turn(user_message, message_lower, rag, remaining_boxes, round_num)
+    decision = _local_decision(user_message)
+    if decision == "OFFER":
+        reply = await agenerate_banker_response(offer_data, user_message, llm, rag)
+        turn = {"decision": decision, "message": reply['message']}
+    elif decision == "CONVERSATION":
+        reply = await agenerate_conversational_response(user_message, rag, llm, remaining_boxes, round_num)
+        turn = {"decision": decision, "message": reply}
+    else:
+        turn = await agenerate_banker_turn(user_message, llm, rag, offer_data)
+        print(f"AI decided response type: {turn['decision']} for message: '{user_message}'")
+    result = _banker_turn_result(turn, user_message, rag, remaining_boxes, burnt_boxes,
+                                 round_num, sentiment, offer_data)
+
+    if cache is not None:
+        cache.put(cache_key, user_message, result, normalized=normalized)
+    return result
+
+def _parse_round_fast(lowered: str) -> Optional[int]:
+    """Find the first 'round <digits>' in an already lowercased message."""
+    length = len(lowered)
+    pos = lowered.find("round")
+    while pos != -1:
+        i = pos + 5
+        start = i
+        while i < length and lowered[i].isspace():
+            i += 1
+        if i > start:
+            digits_start = i
+            while i < length and lowered[i].isdecimal():
+                i += 1
+            if i > digits_start:
+                return int(lowered[digits_start:i])
+        pos = lowered.find("round", pos + 1)
+    return None
 
-def extract_game_state_from_message(user_message: str) -> Optional[Dict[str, Any]]:
+# Returned by _parse_fast when the message needs the regex parser
+_NEEDS_SLOW_PARSE = object()
+
+def _parse_fast(user_message: str, message_lower: Optional[str] = None) -> Any:
+    """Single-pass scan for 'remaining cards: [...]' and 'round N'.
+
+    Returns the game state, None when the message carries no card list, or
+    _NEEDS_SLOW_PARSE when it looks unusual and _parse_slow should decide.
+    """
+    lowered = message_lower if message_lower is not None else user_message.lower()
+    length = len(lowered)
+
+    i = lowered.find("remaining card")
+    if i == -1:
+        return None
+    i += 14
+    if i < length and lowered[i] == "s":
+        i += 1
+    if i >= length or lowered[i] != ":":
+        return _NEEDS_SLOW_PARSE
+    i += 1
+    while i < length and lowered[i].isspace():
+        i += 1
+    if i >= length or lowered[i] != "[":
+        return _NEEDS_SLOW_PARSE
+    i += 1
+
+    remaining_cards = []
+    value = 0
+    has_digits = False
+    after_value = False
+    while i < length:
+        c = lowered[i]
+        if "0" <= c <= "9":
+            if after_value:
+                return _NEEDS_SLOW_PARSE
+            value = value * 10 + (ord(c) - 48)
+            has_digits = True
+        elif c == "," or c == "]":
+            if not has_digits:
+                return _NEEDS_SLOW_PARSE
+            remaining_cards.append(value)
+            if c == "]":
+                break
+            value = 0
+            has_digits = False
+            after_value = False
+        elif c.isspace():
+            after_value = has_digits
+        else:
+            return _NEEDS_SLOW_PARSE
+        i += 1
+    else:
+        return _NEEDS_SLOW_PARSE
+
+    round_num = _parse_round_fast(lowered)
+    return {
+        "remaining_cards": remaining_cards,
+        "round": round_num if round_num is not None else 1,
+        "burnt_cards": []
+    }
+
+def extract_game_state_from_message(user_message: str,
+                                    message_lower: Optional[str] = None) -> Optional[Dict[str, Any]]:
     """Extract game state information from user message if provided."""
     # Look for patterns like "remaining cards: [1, 5, 10, 25, 50, 100, 500, 1000, 2500, 5000, 10000, 25000, 50000, 75000, 100000, 200000, 300000, 400000, 500000, 750000, 1000000]"
-    import re
-    
+    game_state = _parse_fast(user_message, message_lower)
+    if game_state is _NEEDS_SLOW_PARSE:
+        return _parse_slow(user_message)
+    return game_state
+
+def _parse_slow(user_message: str) -> Optional[Dict[str, Any]]:
+    """Regex-based parser, used when the fast path cannot handle the message."""
     # Try to extract remaining cards
-    cards_pattern = r'remaining cards?:\s*\[([^\]]+)\]'
-    cards_match = re.search(cards_pattern, user_message, re.IGNORECASE)
+    cards_match = _CARDS_RE.search(user_message)
     
     if cards_match:
         try:
@@ -262,8 +773,7 @@ def extract_game_state_from_message(user_message: str) -> Optional[Dict[str, Any
             remaining_cards = [int(x.strip()) for x in cards_str.split(',')]
             
             # Try to extract round number
-            round_pattern = r'round\s+(\d+)'
-            round_match = re.search(round_pattern, user_message, re.IGNORECASE)
+            round_match = _ROUND_RE.search(user_message)
             round_num = int(round_match.group(1)) if round_match else 1
             
             return {
@@ -276,9 +786,39 @@ def extract_game_state_from_message(user_message: str) -> Optional[Dict[str, Any
     
     return None
 
-def create_banker_system_prompt() -> str:
-    """Create the system prompt for the banker agent."""
-    return """
+def detect_deal_decision(user_message: str, message_lower: Optional[str] = None) -> Optional[str]:
+    """Return "reject" or "accept" if the player answered the offer, else None.
+
+    Rejection wins when both kinds of phrase appear (e.g. "no deal").
+    """
+    if message_lower is None:
+        message_lower = user_message.lower()
+    decision = None
+    for match in _DEAL_PHRASE_RE.finditer(message_lower):
+        if match.lastgroup == "reject":
+            return "reject"
+        decision = "accept"
+    return decision
+
+# Chat message templates shared by the chat agent and the REST server
+OFFER_MESSAGE_TEMPLATE = "**🎯 Round {round} Offer**\n\n💰 **My Offer: ${offer:,}**\n\n💬 **{answer}**"
+CONVERSATION_MESSAGE_TEMPLATE = "**💬 {answer}**"
+DEAL_REJECTED_MESSAGE = "**❌ Deal Rejected**\n\n💬 **Your loss! Better luck next time!**\n\n🎰 **Game Over - Thanks for playing!**"
+DEAL_ACCEPTED_TEMPLATE = "**🎉 DEAL ACCEPTED! 🎉**\n\n💰 **You've won: ${offer:,}**\n\n💬 **Congratulations! You made the smart choice and walked away with guaranteed money!**\n\n🎰 **Game Over - Thanks for playing!**"
+
+def format_banker_message(response: Any) -> str:
+    """Render a process_banker_query result as a chat message."""
+    if not isinstance(response, dict):
+        return str(response)
+    if response.get('offer') is not None:
+        return OFFER_MESSAGE_TEMPLATE.format(
+            round=response['game_state']['round'],
+            offer=response['offer'],
+            answer=response['humanized_answer']
+        )
+    return CONVERSATION_MESSAGE_TEMPLATE.format(answer=response['humanized_answer'])
+
+BANKER_SYSTEM_PROMPT = """
 You are "The Banker" - the legendary master of the Deal or No Deal universe! 🎰 You're not just any banker; you're a charismatic storyteller, a psychological genius, and the coolest person in the room. Think of yourself as that friend who always has the best stories and knows exactly how to make any situation more interesting.
 
 Your Character:
@@ -326,4 +866,8 @@ Always respond with JSON format:
   "message": "Your witty, engaging negotiation line",
   "offer": <number>
 }
-"""
\ No newline at end of file
+"""
+
+def create_banker_system_prompt() -> str:
+    """Create the system prompt for the banker agent."""
+    return BANKER_SYSTEM_PROMPT
@@ -7,14 +7,21 @@ Run this after starting the API server to test the endpoints
 import requests
 import json
 import time
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 API_BASE = "http://localhost:8009"
 
+# One keep-alive session so every call reuses the same connection
+SESSION = requests.Session()
+SESSION.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=8,
+                                     max_retries=Retry(total=2, backoff_factor=0.1)))
+
 def test_health():
     """Test health endpoint"""
     print("🔍 Testing health endpoint...")
     try:
-        response = requests.get(f"{API_BASE}/health")
+        response = SESSION.get(f"{API_BASE}/health")
         print(f"✅ Health check: {response.json()}")
         return True
     except Exception as e:
@@ -39,7 +46,7 @@ def test_start_game():
             "status": "active"
         }
         
-        response = requests.post(f"{API_BASE}/start-game", json={
+        response = SESSION.post(f"{API_BASE}/start-game", json={
             "game_id": game_id,
             "game_state": initial_game_state
         })
@@ -60,7 +67,7 @@ def test_chat(game_id, message, game_state, message_history):
     """Test chatting with banker"""
     print(f"\n💬 Testing chat: '{message}'")
     try:
-        response = requests.post(f"{API_BASE}/chat", json={
+        response = SESSION.post(f"{API_BASE}/chat", json={
             "message": message,
             "game_id": game_id,
             "game_state": game_state,
@@ -85,7 +92,7 @@ def test_game_history(game_id):
     """Test getting game history"""
     print(f"\n📚 Testing game history for {game_id}...")
     try:
-        response = requests.get(f"{API_BASE}/game-history/{game_id}")
+        response = SESSION.get(f"{API_BASE}/game-history/{game_id}")
         data = response.json()
         
         print(f"✅ Game history retrieved:")
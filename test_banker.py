@@ -125,6 +125,45 @@ def test_meTTa_queries():
     assert confident_mult > desperate_mult, "Confident players should get higher offers"
     print("   ✅ Sentiment multipliers correct")
 
+def test_query_cache():
+    """Test that knowledge lookups are memoized until new knowledge is added."""
+    print("\n🗄️ Testing Knowledge Query Cache...")
+    
+    metta = MeTTa()
+    initialize_banker_knowledge(metta)
+    rag = BankerRAG(metta)
+    rag.warm_cache()
+    
+    phrase = rag.get_drama_phrase("final_countdown")
+    print(f"   Unknown phrase before add_knowledge: {phrase}")
+    assert phrase == "The stakes are high! 💰", "Unknown phrase should use the default"
+    
+    rag.add_knowledge("drama_phrase", "final_countdown", "Tick tock, champ! ⏰")
+    phrase = rag.get_drama_phrase("final_countdown")
+    print(f"   Phrase after add_knowledge: {phrase}")
+    assert phrase == "Tick tock, champ! ⏰", "add_knowledge should invalidate cached lookups"
+    print("   ✅ Query cache invalidation correct")
+
+def test_fact_lookups():
+    """Test that seeded facts answer offer lookups the same way MeTTa does."""
+    print("\n📇 Testing Seeded Fact Lookups...")
+    
+    from metta.knowledge import BANKER_FACT_VALUES
+    
+    metta = MeTTa()
+    initialize_banker_knowledge(metta)
+    queried = BankerRAG(metta)
+    seeded = BankerRAG(metta, facts=BANKER_FACT_VALUES)
+    
+    for round_num in (1, 3, 5):
+        assert seeded.get_house_edge_multiplier(round_num) == queried.get_house_edge_multiplier(round_num)
+    for sentiment in ("confident", "desperate", "aggressive", "neutral"):
+        assert seeded.get_sentiment_multiplier(sentiment) == queried.get_sentiment_multiplier(sentiment)
+    for cards in ([1, 100, 1000, 100000, 1000000], [1000, 1100, 1200, 1300, 1400], [100, 200, 400]):
+        assert seeded.get_risk_adjustment(cards) == queried.get_risk_adjustment(cards)
+    assert not seeded._query_cache, "Seeded facts should not need MeTTa queries"
+    print("   ✅ Seeded facts match MeTTa queries")
+
 def test_risk_adjustments():
     """Test risk adjustment calculations."""
     print("\n⚖️ Testing Risk Adjustments...")
@@ -156,6 +195,8 @@ def main():
         test_meTTa_queries()
         test_sentiment_analysis()
         test_risk_adjustments()
+        test_fact_lookups()
+        test_query_cache()
         test_banker_calculations()
         
         print("\n🎉 All tests passed! The Banker Agent is ready to play!")
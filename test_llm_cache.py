@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Test script for the banker response cache
+"""
+
+import sys
+import os
+
+# Add the current directory to Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+def test_cache_lookups():
+    """Test exact and near-match lookups."""
+    print("🗄️ Testing Response Cache Lookups...")
+
+    from metta.llm_cache import LLMCache
+
+    cache = LLMCache()
+    key = ((1, 5, 10), (), 1)
+    cache.put(key, "Hello there!", {"humanized_answer": "Welcome!", "offer": None})
+
+    assert cache.exact_get(key, "hello there") == {"humanized_answer": "Welcome!", "offer": None}, "Normalized message should hit"
+    assert cache.exact_get(key, "Hello banker") is None, "Different message should miss"
+    assert cache.exact_get(((1, 5), (), 1), "Hello there!") is None, "Different game state should miss"
+    print("   ✅ Exact lookups working")
+
+    cache.put(key, "what is your offer for me today", {"humanized_answer": "Take $5", "offer": 5})
+    assert cache.semantic_get(key, "so what is your offer for me today")["offer"] == 5, "An extra filler word should hit"
+    assert cache.semantic_get(key, "today what is your offer for me") is None, "Reordered words should miss"
+    assert cache.semantic_get(key, "I want to negotiate") is None, "Unrelated message should miss"
+
+    cache.put(key, "I am ready for your offer now so give me the money please", {"humanized_answer": "Take $50", "offer": 50})
+    for message in ("I am not ready for your offer now so give me the money please",
+                    "I am ready for your offer now so do not give me the money please",
+                    "I am ready for your offer now so don't give me the money please"):
+        assert cache.semantic_get(key, message) is None, f"Negated message should miss: {message}"
+    assert cache.semantic_get(key, "so give me the money please I am ready for your offer now") is None, "Reordered sentence should miss"
+    print("   ✅ Near-match lookups working")
+
+    cached = cache.exact_get(key, "Hello there!")
+    cached["offer"] = 99
+    assert cache.exact_get(key, "Hello there!")["offer"] is None, "Callers should get a copy"
+    print("   ✅ Cached responses are isolated from callers")
+
+def test_cache_eviction():
+    """Test that the cache stays bounded."""
+    print("\n♻️ Testing Response Cache Eviction...")
+
+    from metta.llm_cache import LLMCache
+
+    cache = LLMCache(max_entries=2)
+    cache.put("state", "first", 1)
+    cache.put("state", "second", 2)
+    cache.exact_get("state", "first")
+    cache.put("state", "third", 3)
+
+    assert len(cache) == 2, f"Cache should hold 2 entries, got {len(cache)}"
+    assert cache.exact_get("state", "second") is None, "Least recently used entry should be evicted"
+    assert cache.exact_get("state", "first") == 1, "Recently used entry should survive"
+    assert cache.semantic_get("state", "second") is None, "Evicted entry should not match fuzzily"
+    print("   ✅ LRU eviction working")
+
+def test_cache_persistence():
+    """Test saving the cache to disk and loading it back."""
+    print("\n💾 Testing Response Cache Persistence...")
+
+    import tempfile
+    from metta.llm_cache import LLMCache
+
+    cache = LLMCache()
+    key = ((1, 5, 10), (), 1)
+    cache.put(key, "What's your offer?", {"humanized_answer": "Take $5", "offer": 5, "game_state": {"remaining_boxes": [1, 5, 10]}})
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "cache.json")
+        cache.save(path)
+
+        restored = LLMCache()
+        assert restored.load(path) == 1, "Should load one entry"
+        assert restored.exact_get(key, "what's your offer")["offer"] == 5, "Loaded entry should hit with a tuple key"
+        assert restored.semantic_get(key, "so what's your offer", threshold=0.8)["offer"] == 5, "Loaded entry should match fuzzily"
+        assert restored.semantic_get(key, "your offer what's", threshold=0.8) is None, "Loaded entry should not match reordered words"
+        assert LLMCache().load(os.path.join(tmp_dir, "missing.json")) == 0, "Missing file should load nothing"
+
+        for garbage in ('[["state", "trunc', '{"not": "a list"}', '[1, 2, 3]'):
+            with open(path, "w") as f:
+                f.write(garbage)
+            empty = LLMCache()
+            assert empty.load(path) == 0, f"Corrupt file should load nothing: {garbage}"
+            assert len(empty) == 0, "Corrupt file should leave the cache empty"
+    print("   ✅ Save and load working, corrupt files skipped")
+
+def test_cached_llm():
+    """Test that short completions are reused and long ones are not."""
+    print("\n🔁 Testing Cached LLM Wrapper...")
+
+    import asyncio
+    from metta.llm_cache import CachedLLM
+
+    class CountingLLM:
+        def __init__(self):
+            self.calls = 0
+
+        def create_completion(self, prompt, max_tokens=200, system=None, stop=None,
+                              response_format=None):
+            self.calls += 1
+            return "OFFER" if max_tokens <= 10 else f"Reply {self.calls}"
+
+        async def acreate_completion(self, prompt, max_tokens=200, system=None, stop=None,
+                                     response_format=None):
+            return self.create_completion(prompt, max_tokens, system, stop, response_format)
+
+    base = CountingLLM()
+    llm = CachedLLM(base)
+    for _ in range(5):
+        assert llm.create_completion("Player's message: \"Hello\"", max_tokens=3, system="decide") == "OFFER"
+    assert base.calls == 1, f"Repeated classification should call the LLM once, got {base.calls}"
+    assert llm.stats == {"hits": 4, "misses": 1}, f"Unexpected stats: {llm.stats}"
+
+    llm.create_completion("Player's message: \"Hello\"", max_tokens=3, system="other")
+    assert base.calls == 2, "A different system prompt should miss"
+    assert asyncio.run(llm.acreate_completion("Player's message: \"Hello\"", max_tokens=3, system="decide")) == "OFFER"
+    assert base.calls == 2, "Async calls should share the cache"
+    print("   ✅ Short completions cached")
+
+    assert llm.create_completion("Tell me a story") != llm.create_completion("Tell me a story")
+    assert base.calls == 4, "Long completions should never be cached"
+    print("   ✅ Long completions passed through")
+
+    small = CachedLLM(CountingLLM(), max_entries=1)
+    small.create_completion("first", max_tokens=3)
+    small.create_completion("second", max_tokens=3)
+    small.create_completion("first", max_tokens=3)
+    assert small.llm.calls == 3, "Least recently used completion should be evicted"
+    print("   ✅ Cached completions bounded")
+
+def main():
+    """Run all tests."""
+    print("🗄️ Response Cache Test Suite 🗄️")
+    print("=" * 50)
+
+    try:
+        test_cache_lookups()
+        test_cache_eviction()
+        test_cache_persistence()
+        test_cached_llm()
+
+        print("\n🎉 All response cache tests passed!")
+
+    except Exception as e:
+        print(f"\n❌ Test failed: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+    return 0
+
+if __name__ == "__main__":
+    exit(main())
@@ -13,15 +13,13 @@ def test_no_house_messages():
     """Test that discouraging house messages have been removed."""
     print("🚫 Testing Removal of Discouraging House Messages...")
     
+    from metta.utils import DEAL_ACCEPTED_TEMPLATE, DEAL_REJECTED_MESSAGE, detect_deal_decision
+    
     # Test deal rejection message
     user_message_lower = "no deal"
-    deal_phrases = ["accept", "yes", "take it", "i'll take it", "agreed", "i accept", "deal accepted", "take the deal"]
-    rejects_deal = any(phrase in user_message_lower for phrase in ["no deal", "reject", "pass", "no thanks", "decline", "not interested"])
     
-    if rejects_deal:
-        answer_text = f"**❌ Deal Rejected**\n\n"
-        answer_text += f"💬 **Your loss! Better luck next time!**\n\n"
-        answer_text += f"🎰 **Game Over - Thanks for playing!**"
+    if detect_deal_decision(user_message_lower, user_message_lower) == "reject":
+        answer_text = DEAL_REJECTED_MESSAGE
     
     print("   Deal rejection message:")
     print(f"   {answer_text}")
@@ -33,11 +31,8 @@ def test_no_house_messages():
     
     # Test deal acceptance message
     user_message_lower = "accept"
-    if any(phrase in user_message_lower for phrase in deal_phrases):
-        answer_text = f"**🎉 DEAL ACCEPTED! 🎉**\n\n"
-        answer_text += f"💰 **You've won: $50,000**\n\n"
-        answer_text += f"💬 **Congratulations! You made the smart choice and walked away with guaranteed money!**\n\n"
-        answer_text += f"🎰 **Game Over - Thanks for playing!**"
+    if detect_deal_decision(user_message_lower, user_message_lower) == "accept":
+        answer_text = DEAL_ACCEPTED_TEMPLATE.format(offer=50000)
     
     print("\n   Deal acceptance message:")
     print(f"   {answer_text}")